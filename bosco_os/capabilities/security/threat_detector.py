@@ -7,17 +7,99 @@ import os
 import re
 import threading
 import time
+import itertools
+import functools
+import bisect
 import json
 from datetime import datetime, timedelta
-from typing import Dict, List, Any, Optional, Callable
+from typing import Dict, List, Any, Optional, Callable, Deque
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
-import hashlib
 
 try:
-    import psutil
-    PSUTIL_AVAILABLE = True
+    import ahocorasick
+    AHOCORASICK_AVAILABLE = True
 except ImportError:
-    PSUTIL_AVAILABLE = False
+    AHOCORASICK_AVAILABLE = False
+
+try:
+    import re2
+    RE2_AVAILABLE = True
+    _RE2_OPTIONS = re2.Options()
+    _RE2_OPTIONS.case_sensitive = False
+    _RE2_OPTIONS.log_errors = False
+except ImportError:
+    RE2_AVAILABLE = False
+
+
+# Order patterns are tried in; unknown severities sort last
+SEVERITY_RANK = {"critical": 0, "high": 1, "medium": 2, "low": 3}
+
+
+# Characters that make a pattern more than a plain keyword alternation
+_REGEX_METACHARS = frozenset(".^$*+?{}[]\\|()")
+
+
+def _literal_alternatives(pattern: str) -> Optional[List[str]]:
+    """Return the lowercased keywords of a pure ``a|b|c`` pattern, else None"""
+    alternatives = pattern.split("|")
+    for alt in alternatives:
+        if not alt or any(ch in _REGEX_METACHARS for ch in alt):
+            return None
+    return [alt.lower() for alt in alternatives]
+
+
+# Block scans search many lines joined together, so ^ and $ must match at
+# every line boundary; on a single line this is the same as no MULTILINE
+_REGEX_FLAGS = re.IGNORECASE | re.MULTILINE
+
+# Longest pattern accepted; keeps user-added rules from bloating the scan
+MAX_PATTERN_LENGTH = 1024
+
+# Distinct compiled patterns shared by every ThreatPattern
+_REGEX_CACHE_SIZE = 256
+
+
+@functools.lru_cache(maxsize=_REGEX_CACHE_SIZE)
+def _compile_pattern(pattern: str):
+    """
+    Compile case-insensitively and multiline, preferring RE2's linear-time engine
+    
+    Results are memoized in a bounded LRU. Raises re.error for invalid
+    patterns and ones over MAX_PATTERN_LENGTH.
+    """
+    compiled = None
+    if len(pattern) > MAX_PATTERN_LENGTH:
+        raise re.error(f"pattern longer than {MAX_PATTERN_LENGTH} characters")
+    
+    if RE2_AVAILABLE:
+        try:
+            compiled = re2.compile("(?m)" + pattern, _RE2_OPTIONS)
+        except re2.error:
+            pass  # RE2 has no backreferences/lookaround; use re instead
+    if compiled is None:
+        compiled = re.compile(pattern, _REGEX_FLAGS)
+    
+    return compiled
+
+
+def _tail_lines(path: str, n: int, chunk_size: int = 8192) -> List[str]:
+    """Return the last n lines of a file, reading backwards from the end"""
+    with open(path, 'rb') as f:
+        f.seek(0, os.SEEK_END)
+        position = f.tell()
+        buffer = b''
+        
+        # n complete lines need n + 1 newlines unless we reach the start
+        while position > 0 and buffer.count(b'\n') <= n:
+            read_size = min(chunk_size, position)
+            position -= read_size
+            f.seek(position)
+            buffer = f.read(read_size) + buffer
+    
+    lines = buffer.splitlines(keepends=True)[-n:] if n > 0 else []
+    return [line.decode('utf-8', errors='replace') for line in lines]
 
 
 class ThreatPattern:
@@ -33,29 +115,43 @@ class ThreatPattern:
     ):
         self.name = name
         self.pattern = pattern
+        self.pattern_lower = pattern.lower()
         self.severity = severity  # critical, high, medium, low
         self.description = description
         self.regex = regex
         
+        # Plain keywords can be matched by the detector's literal automaton
+        if regex:
+            self.keywords = _literal_alternatives(pattern)
+        else:
+            self.keywords = [self.pattern_lower]
+        
         if regex:
             try:
-                self.compiled = re.compile(pattern, re.IGNORECASE)
-            except:
+                self.compiled = _compile_pattern(pattern)
+            except re.error as e:
+                # Falls back to plain substring matching in match()
+                print(f"[ThreatDetector] Invalid pattern '{name}': {e}")
                 self.compiled = None
         else:
             self.compiled = None
     
-    def match(self, text: str) -> bool:
-        """Check if text matches this pattern"""
+    def match(self, text: str, text_lower: Optional[str] = None) -> bool:
+        """Check if text matches this pattern (text_lower may be pre-computed)"""
         if self.regex and self.compiled:
             return bool(self.compiled.search(text))
         else:
-            return self.pattern.lower() in text.lower()
+            if text_lower is None:
+                text_lower = text.lower()
+            return self.pattern_lower in text_lower
 
 
 class ThreatEvent:
     """Represents a detected threat event"""
     
+    # Per-process sequence so ids stay unique within the same millisecond
+    _sequence = itertools.count(1)
+    
     def __init__(
         self,
         pattern_name: str,
@@ -64,26 +160,34 @@ class ThreatEvent:
         source: str,
         details: Dict = None
     ):
-        self.id = f"threat_{int(time.time() * 1000)}"
+        self.timestamp = datetime.now()
+        self.timestamp_iso = self.timestamp.isoformat()
+        self.id = f"threat_{int(self.timestamp.timestamp() * 1000)}_{next(self._sequence)}"
         self.pattern_name = pattern_name
         self.severity = severity
         self.description = description
         self.source = source
         self.details = details or {}
-        self.timestamp = datetime.now()
         self.acknowledged = False
+        self._cached_dict: Optional[Dict] = None
     
     def to_dict(self) -> Dict:
-        return {
-            "id": self.id,
-            "pattern_name": self.pattern_name,
-            "severity": self.severity,
-            "description": self.description,
-            "source": self.source,
-            "details": self.details,
-            "timestamp": self.timestamp.isoformat(),
-            "acknowledged": self.acknowledged
-        }
+        # Everything but the acknowledged flag is fixed at construction
+        if self._cached_dict is None:
+            self._cached_dict = {
+                "id": self.id,
+                "pattern_name": self.pattern_name,
+                "severity": self.severity,
+                "description": self.description,
+                "source": self.source,
+                "details": self.details,
+                "timestamp": self.timestamp_iso,
+                "acknowledged": False
+            }
+        
+        data = dict(self._cached_dict)
+        data["acknowledged"] = self.acknowledged
+        return data
 
 
 class ThreatDetector:
@@ -92,15 +196,62 @@ class ThreatDetector:
     Monitors logs, processes, and network for suspicious activity
     """
     
+    # Ports commonly used by backdoors, shells and proxies
+    _SUSPICIOUS_PORTS = frozenset({31337, 1337, 4444, 5555, 6666, 8080, 3128})
+    
+    # Offensive / sniffing tools, matched as whole words in one scan
+    _SUSPICIOUS_PROC_RE = re.compile(
+        r"\b(nc|netcat|ncat|msfconsole|msfvenom|hydra|john|hashcat"
+        r"|aircrack|reaver|wireshark|tcpdump)\b",
+        re.IGNORECASE
+    )
+    
+    # Authentication logs checked by detect_in_auth_logs
+    _AUTH_LOG_PATHS = ("/var/log/auth.log", "/var/log/secure", "/var/log/syslog")
+    
+    # Scans between re-checking which auth logs exist (rotation, new installs)
+    _AUTH_LOG_REFRESH_SCANS = 60
+    
+    # Debounce entries kept before expired ones are pruned
+    _LAST_FIRE_PRUNE_AT = 256
+    
     def __init__(self, config: Dict = None):
         self.config = config or {}
         
-        # Detection patterns
+        # For pure alerting: stop scanning a text once a critical pattern fires
+        self.stop_on_first_critical = self.config.get("stop_on_first_critical", False)
+        
+        # Detection patterns (kept sorted by severity, critical first)
         self.patterns: List[ThreatPattern] = []
         
+        # Guards pattern changes and the lazy matcher rebuilds; scans run in
+        # several threads and must never see a half-built automaton
+        self._patterns_lock = threading.RLock()
+        
+        # Aho-Corasick automaton over keyword-only patterns (built lazily)
+        self._automaton = None
+        
+        # RE2 set over the remaining regex patterns (built lazily)
+        self._regex_set = None
+        
         # Detected events
-        self.events: List[ThreatEvent] = []
         self.max_events = 1000
+        self.events: Deque[ThreatEvent] = deque(maxlen=self.max_events)
+        
+        # Severity tally of the stored events, kept in step with self.events
+        self._severity_counts = {
+            "critical": 0,
+            "high": 0,
+            "medium": 0,
+            "low": 0
+        }
+        
+        # Events may be recorded from several scanner threads at once
+        self._events_lock = threading.Lock()
+        
+        # Last (monotonic time, event) per (pattern, source) for debouncing
+        self._last_fire: Dict[tuple, tuple] = {}
+        self._debounce_sec = self.config.get("debounce_seconds", 1.0)
         
         # Monitoring state
         self.is_monitoring = False
@@ -116,6 +267,17 @@ class ThreatDetector:
             "start_time": None
         }
         
+        # psutil is imported on first process/network scan
+        self._psutil = None
+        
+        # Short-lived cache of psutil.net_connections() as (timestamp, conns)
+        self._net_cache = (0.0, [])
+        self._net_cache_ttl = self.config.get("net_cache_ttl", 5.0)
+        
+        # Auth logs that exist here, so scans skip stat() on missing ones
+        self._auth_log_paths: Optional[List[str]] = None
+        self._auth_log_scans = 0
+        
         # Initialize default patterns
         self._init_default_patterns()
     
@@ -201,47 +363,239 @@ class ThreatDetector:
     
     def add_pattern(self, pattern: ThreatPattern):
         """Add a detection pattern"""
-        self.patterns.append(pattern)
+        with self._patterns_lock:
+            # Replace the list rather than mutate it so running scans keep a stable copy
+            self.patterns = sorted(
+                self.patterns + [pattern],
+                key=lambda p: SEVERITY_RANK.get(p.severity, len(SEVERITY_RANK))
+            )
+            self._automaton = None
+            self._regex_set = None
     
     def remove_pattern(self, name: str):
         """Remove a detection pattern"""
-        self.patterns = [p for p in self.patterns if p.name != name]
+        with self._patterns_lock:
+            self.patterns = [p for p in self.patterns if p.name != name]
+            self._automaton = None
+            self._regex_set = None
+    
+    def _get_automaton(self):
+        """Build the keyword automaton for literal-only patterns"""
+        with self._patterns_lock:
+            if self._automaton is None:
+                needles: Dict[str, List[ThreatPattern]] = {}
+                for pattern in self.patterns:
+                    for keyword in pattern.keywords or ():
+                        needles.setdefault(keyword, []).append(pattern)
+                
+                automaton = ahocorasick.Automaton()
+                for keyword, patterns in needles.items():
+                    automaton.add_word(keyword, tuple(patterns))
+                if needles:
+                    automaton.make_automaton()
+                self._automaton = automaton
+            return self._automaton
+    
+    @staticmethod
+    def _match_literals(automaton, text_lower: str) -> Optional[set]:
+        """Return ids of keyword patterns the automaton finds in lowercased text in one pass"""
+        if automaton is None:
+            return None
+        
+        if len(automaton) == 0:
+            return set()
+        
+        hits = set()
+        for _, patterns in automaton.iter(text_lower):
+            hits.update(id(p) for p in patterns)
+        return hits
+    
+    def _get_regex_set(self):
+        """Build the RE2 set of regex patterns not covered by the automaton"""
+        with self._patterns_lock:
+            if self._regex_set is None:
+                regex_set = re2.Set.SearchSet(_RE2_OPTIONS)
+                members = []
+                for pattern in self.patterns:
+                    if not pattern.regex or pattern.compiled is None:
+                        continue
+                    if AHOCORASICK_AVAILABLE and pattern.keywords:
+                        continue
+                    try:
+                        regex_set.Add("(?m)" + pattern.pattern)
+                    except re2.error:
+                        continue  # Matched individually by its own compiled regex
+                    members.append(pattern)
+                if members:
+                    regex_set.Compile()
+                self._regex_set = (regex_set, members, {id(p) for p in members})
+            return self._regex_set
+    
+    @staticmethod
+    def _match_regex_set(compiled_set, text: str):
+        """Return (handled ids, matched ids) for a _get_regex_set result, or None"""
+        if compiled_set is None:
+            return None
+        
+        regex_set, members, member_ids = compiled_set
+        if not members:
+            return None
+        
+        return member_ids, {id(members[i]) for i in regex_set.Match(text) or ()}
     
     def detect_in_text(self, text: str, source: str = "unknown") -> List[ThreatEvent]:
         """Detect threats in text"""
         events = []
+        text_lower = text.lower()
+        
+        # Take the patterns and both matchers together so a concurrent
+        # add_pattern cannot leave them out of step mid-scan
+        with self._patterns_lock:
+            patterns = self.patterns
+            automaton = self._get_automaton() if AHOCORASICK_AVAILABLE else None
+            compiled_set = self._get_regex_set() if RE2_AVAILABLE else None
+        
+        literal_hits = self._match_literals(automaton, text_lower)
+        regex_hits = self._match_regex_set(compiled_set, text)
+        
+        for pattern in patterns:
+            if literal_hits is not None and pattern.keywords:
+                matched = id(pattern) in literal_hits
+            elif regex_hits is not None and id(pattern) in regex_hits[0]:
+                matched = id(pattern) in regex_hits[1]
+            else:
+                matched = pattern.match(text, text_lower)
+            
+            if matched:
+                event = self._raise_event(pattern, source, text)
+                if event:
+                    events.append(event)
+                if self.stop_on_first_critical and pattern.severity == "critical":
+                    break
         
-        for pattern in self.patterns:
-            if pattern.match(text):
-                event = ThreatEvent(
-                    pattern_name=pattern.name,
-                    severity=pattern.severity,
-                    description=pattern.description,
-                    source=source,
-                    details={"matched_text": text[:200]}
-                )
-                events.append(event)
-                self._handle_threat_event(event)
+        return events
+    
+    def _detect_in_lines(self, lines: List[str], source: str) -> List[ThreatEvent]:
+        """
+        Detect threats in a block of lines, one scan per pattern
+        
+        Each pattern searches the joined block once and match offsets are
+        mapped back to lines, giving the same events as calling
+        detect_in_text per line without a Python-level loop per line.
+        """
+        if not lines:
+            return []
+        
+        blob = ''.join(lines)
+        lowered = [line.lower() for line in lines]
+        blob_lower = ''.join(lowered)
+        
+        # Offsets where each line starts, to map match positions to lines
+        starts = list(itertools.accumulate((len(l) for l in lines[:-1]), initial=0))
+        starts_lower = list(itertools.accumulate((len(l) for l in lowered[:-1]), initial=0))
+        
+        # Take the patterns and automaton together so a concurrent
+        # add_pattern cannot leave them out of step mid-scan
+        with self._patterns_lock:
+            all_patterns = self.patterns
+            automaton = self._get_automaton() if AHOCORASICK_AVAILABLE else None
+        
+        hits = set()  # (line index, pattern index)
+        pattern_index = {id(p): i for i, p in enumerate(all_patterns)}
+        
+        if automaton is not None and len(automaton) > 0:
+            for end, patterns in automaton.iter(blob_lower):
+                line_no = bisect.bisect_right(starts_lower, end) - 1
+                for pattern in patterns:
+                    hits.add((line_no, pattern_index[id(pattern)]))
+        
+        for index, pattern in enumerate(all_patterns):
+            if AHOCORASICK_AVAILABLE and pattern.keywords:
+                continue
+            
+            # After a hit, resume at the next line: one event per line
+            position = 0
+            while True:
+                if pattern.regex and pattern.compiled:
+                    match = pattern.compiled.search(blob, position)
+                    if not match:
+                        break
+                    line_no = bisect.bisect_right(starts, match.start()) - 1
+                    line_starts = starts
+                else:
+                    found = blob_lower.find(pattern.pattern_lower, position)
+                    if found < 0:
+                        break
+                    line_no = bisect.bisect_right(starts_lower, found) - 1
+                    line_starts = starts_lower
+                
+                hits.add((line_no, index))
+                if line_no + 1 >= len(lines):
+                    break
+                position = line_starts[line_no + 1]
         
+        events = []
+        stopped_line = None
+        for line_no, index in sorted(hits):
+            if line_no == stopped_line:
+                continue
+            pattern = all_patterns[index]
+            event = self._raise_event(pattern, source, lines[line_no])
+            if event:
+                events.append(event)
+            if self.stop_on_first_critical and pattern.severity == "critical":
+                stopped_line = line_no
         return events
     
+    def _raise_event(self, pattern: ThreatPattern, source: str, text: str) -> Optional[ThreatEvent]:
+        """
+        Create and record the event for a pattern that matched text
+        
+        Repeats of the same (pattern, source) within the debounce window are
+        folded into the last emitted event's suppressed_count and return None.
+        """
+        key = (pattern.name, source)
+        now = time.monotonic()
+        
+        # Check and record under one lock so concurrent scanners fire once
+        with self._events_lock:
+            last = self._last_fire.get(key)
+            if last is not None and now - last[0] < self._debounce_sec:
+                details = last[1].details
+                details["suppressed_count"] = details.get("suppressed_count", 0) + 1
+                return None
+            
+            event = ThreatEvent(
+                pattern_name=pattern.name,
+                severity=pattern.severity,
+                description=pattern.description,
+                source=source,
+                details={"matched_text": text[:200]}
+            )
+            if len(self._last_fire) >= self._LAST_FIRE_PRUNE_AT:
+                self._prune_last_fire(now)
+            self._last_fire[key] = (now, event)
+        
+        self._handle_threat_event(event)
+        return event
+    
+    def _prune_last_fire(self, now: float):
+        """Forget debounce entries whose window has passed (caller holds the lock)"""
+        expired = [key for key, (fired, _) in self._last_fire.items()
+                   if now - fired >= self._debounce_sec]
+        for key in expired:
+            del self._last_fire[key]
+    
     def detect_in_log(self, log_path: str, lines: int = 100) -> List[ThreatEvent]:
         """Scan a log file for threats"""
         events = []
         
-        if not os.path.exists(log_path):
-            return events
-        
         try:
-            with open(log_path, 'r') as f:
-                # Read last N lines
-                all_lines = f.readlines()
-                recent_lines = all_lines[-lines:] if len(all_lines) > lines else all_lines
-                
-                for line in recent_lines:
-                    line_events = self.detect_in_text(line, source=log_path)
-                    events.extend(line_events)
+            # Read last N lines without loading the whole file
+            events = self._detect_in_lines(_tail_lines(log_path, lines), source=log_path)
         
+        except FileNotFoundError:
+            pass
         except PermissionError:
             print(f"[ThreatDetector] Permission denied: {log_path}")
         except Exception as e:
@@ -253,40 +607,33 @@ class ThreatDetector:
         """Scan running processes for suspicious activity"""
         events = []
         
-        if not PSUTIL_AVAILABLE:
+        psutil = self._get_psutil()
+        if psutil is None:
             return events
         
         try:
-            # Suspicious process names
-            suspicious_names = [
-                "nc", "netcat", "ncat",
-                "msfconsole", "msfvenom",
-                "hydra", "john", "hashcat",
-                "aircrack", "reaver",
-                "wireshark", "tcpdump"
-            ]
-            
             for proc in psutil.process_iter(['pid', 'name', 'cmdline']):
                 try:
-                    proc_name = proc.info['name'].lower()
-                    cmdline = ' '.join(proc.info['cmdline'] or []).lower()
+                    # Check the name first; only build the cmdline string if needed
+                    suspicious = self._SUSPICIOUS_PROC_RE.search(proc.info['name'] or '')
+                    if not suspicious:
+                        cmdline = ' '.join(proc.info['cmdline'] or [])
+                        suspicious = self._SUSPICIOUS_PROC_RE.search(cmdline)
                     
-                    for sus_name in suspicious_names:
-                        if sus_name in proc_name or sus_name in cmdline:
-                            event = ThreatEvent(
-                                pattern_name="suspicious_process",
-                                severity="high",
-                                description=f"Suspicious process: {proc.info['name']}",
-                                source="process_scan",
-                                details={
-                                    "pid": proc.info['pid'],
-                                    "name": proc.info['name'],
-                                    "cmdline": proc.info['cmdline']
-                                }
-                            )
-                            events.append(event)
-                            self._handle_threat_event(event)
-                            break
+                    if suspicious:
+                        event = ThreatEvent(
+                            pattern_name="suspicious_process",
+                            severity="high",
+                            description=f"Suspicious process: {proc.info['name']}",
+                            source="process_scan",
+                            details={
+                                "pid": proc.info['pid'],
+                                "name": proc.info['name'],
+                                "cmdline": proc.info['cmdline']
+                            }
+                        )
+                        events.append(event)
+                        self._handle_threat_event(event)
                 
                 except (psutil.NoSuchProcess, psutil.AccessDenied):
                     pass
@@ -300,19 +647,19 @@ class ThreatDetector:
         """Scan network connections for suspicious activity"""
         events = []
         
-        if not PSUTIL_AVAILABLE:
+        psutil = self._get_psutil()
+        if psutil is None:
             return events
         
         try:
-            suspicious_ports = [31337, 1337, 4444, 5555, 6666, 8080, 3128]
             suspicious_ips = []  # Could integrate with threat intelligence
             
-            for conn in psutil.net_connections(kind='inet'):
+            for conn in self._get_net_connections():
                 try:
                     # Check suspicious ports
                     if conn.raddr:
                         port = conn.raddr.port
-                        if port in suspicious_ports:
+                        if port in self._SUSPICIOUS_PORTS:
                             event = ThreatEvent(
                                 pattern_name="suspicious_connection",
                                 severity="high",
@@ -335,34 +682,63 @@ class ThreatDetector:
         
         return events
     
+    def _get_psutil(self):
+        """Import psutil on first use; None when it is not installed"""
+        if self._psutil is None:
+            try:
+                import psutil
+            except ImportError:
+                return None
+            self._psutil = psutil
+        return self._psutil
+    
+    def _get_net_connections(self) -> List:
+        """Return inet connections, reusing a recent snapshot within the TTL"""
+        timestamp, conns = self._net_cache
+        now = time.time()
+        if now - timestamp >= self._net_cache_ttl:
+            conns = self._psutil.net_connections(kind='inet')
+            self._net_cache = (now, conns)
+        return conns
+    
     def detect_in_auth_logs(self) -> List[ThreatEvent]:
         """Analyze authentication logs"""
         events = []
         
-        log_paths = [
-            "/var/log/auth.log",
-            "/var/log/secure",
-            "/var/log/syslog"
-        ]
+        existing = self._get_auth_log_paths()
+        if not existing:
+            return events
         
-        for log_path in log_paths:
-            if os.path.exists(log_path):
-                log_events = self.detect_in_log(log_path, lines=50)
-                events.extend(log_events)
+        # Log reads are I/O-bound and release the GIL, so scan them in parallel
+        with ThreadPoolExecutor(max_workers=len(existing)) as executor:
+            futures = [executor.submit(self.detect_in_log, p, 50) for p in existing]
+            for future in futures:
+                events.extend(future.result())
         
         return events
     
+    def _get_auth_log_paths(self) -> List[str]:
+        """Auth log paths present on this host, re-checked every few scans"""
+        if self._auth_log_paths is None or self._auth_log_scans >= self._AUTH_LOG_REFRESH_SCANS:
+            self._auth_log_paths = [p for p in self._AUTH_LOG_PATHS if os.path.exists(p)]
+            self._auth_log_scans = 0
+        self._auth_log_scans += 1
+        return self._auth_log_paths
+    
     def _handle_threat_event(self, event: ThreatEvent):
         """Handle a detected threat event"""
-        # Store event
-        self.events.append(event)
-        
-        # Limit stored events
-        if len(self.events) > self.max_events:
-            self.events = self.events[-self.max_events:]
-        
-        # Update stats
-        self.stats["threats_detected"] += 1
+        with self._events_lock:
+            # Store event (the deque drops the oldest once max_events is reached)
+            if len(self.events) == self.events.maxlen:
+                evicted = self.events[0].severity
+                if evicted in self._severity_counts:
+                    self._severity_counts[evicted] -= 1
+            self.events.append(event)
+            if event.severity in self._severity_counts:
+                self._severity_counts[event.severity] += 1
+            
+            # Update stats
+            self.stats["threats_detected"] += 1
         
         # Trigger callbacks
         for callback in self.alert_callbacks:
@@ -378,6 +754,8 @@ class ThreatDetector:
         
         self.is_monitoring = True
         self.stats["start_time"] = datetime.now()
+        self._net_cache_ttl = interval / 2
+        self._auth_log_paths = None
         
         def monitor_loop():
             while self.is_monitoring:
@@ -418,7 +796,8 @@ class ThreatDetector:
         limit: int = 100
     ) -> List[ThreatEvent]:
         """Get threat events with optional filtering"""
-        events = self.events
+        with self._events_lock:
+            events = list(self.events)
         
         if severity:
             events = [e for e in events if e.severity == severity]
@@ -430,20 +809,9 @@ class ThreatDetector:
     
     def get_threat_summary(self) -> Dict:
         """Get summary of detected threats"""
-        severity_counts = {
-            "critical": 0,
-            "high": 0,
-            "medium": 0,
-            "low": 0
-        }
-        
-        for event in self.events:
-            if event.severity in severity_counts:
-                severity_counts[event.severity] += 1
-        
         return {
             "total_threats": len(self.events),
-            "severity_counts": severity_counts,
+            "severity_counts": dict(self._severity_counts),
             "is_monitoring": self.is_monitoring,
             "stats": self.stats,
             "patterns_loaded": len(self.patterns)
@@ -451,27 +819,47 @@ class ThreatDetector:
     
     def acknowledge_threat(self, event_id: str):
         """Acknowledge a threat event"""
-        for event in self.events:
-            if event.id == event_id:
-                event.acknowledged = True
-                break
+        with self._events_lock:
+            for event in self.events:
+                if event.id == event_id:
+                    event.acknowledged = True
+                    break
     
     def clear_events(self):
         """Clear all threat events"""
-        self.events.clear()
+        with self._events_lock:
+            self.events.clear()
+            self._last_fire.clear()
+            for severity in self._severity_counts:
+                self._severity_counts[severity] = 0
         print("[ThreatDetector] Events cleared")
     
-    def export_report(self, filepath: str) -> bool:
-        """Export threat report to JSON"""
+    def export_report(self, filepath: str, pretty: bool = False) -> bool:
+        """Export threat report to JSON (compact and streamed unless pretty)"""
         try:
-            report = {
+            with self._events_lock:
+                events = list(self.events)
+            
+            header = {
                 "generated_at": datetime.now().isoformat(),
-                "summary": self.get_threat_summary(),
-                "events": [e.to_dict() for e in self.events]
+                "summary": self.get_threat_summary()
             }
             
             with open(filepath, 'w') as f:
-                json.dump(report, f, indent=2)
+                if pretty:
+                    header["events"] = [e.to_dict() for e in events]
+                    json.dump(header, f, indent=2, default=str)
+                    return True
+                
+                # Write events one at a time rather than building the full list
+                separators = (',', ':')
+                f.write(json.dumps(header, separators=separators, default=str)[:-1])
+                f.write(',"events":[')
+                for i, event in enumerate(events):
+                    if i:
+                        f.write(',')
+                    json.dump(event.to_dict(), f, separators=separators, default=str)
+                f.write(']}')
             
             return True
         except Exception as e:
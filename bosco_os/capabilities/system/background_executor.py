@@ -11,9 +11,17 @@ import time
 import queue
 from typing import Dict, Any, Optional, Callable
 from datetime import datetime
+from collections import deque
 import signal
 import fcntl
 import select
+import selectors
+import codecs
+import shlex
+
+
+# Characters that need a shell to interpret the command
+_SHELL_METACHARS = frozenset('|&;<>()$`\\*?[]{}~\n')
 
 
 class BackgroundExecutor:
@@ -70,18 +78,16 @@ class BackgroundExecutor:
         if not task_name:
             task_name = command[:50]
         
-        # Prepare command with sudo if needed
-        if use_sudo:
-            if self.is_sudo_valid():
-                command = f"echo '{self.sudo_password}' | sudo -S {command}"
-            else:
-                return "Error: No sudo password cached. Say 'cache sudo password' first."
+        # The password is written to sudo's stdin when the task starts
+        if use_sudo and not self.is_sudo_valid():
+            return "Error: No sudo password cached. Say 'cache sudo password' first."
         
         # Create task info
         task_info = {
             'id': task_id,
             'name': task_name,
             'command': command,
+            'use_sudo': use_sudo,
             'start_time': datetime.now(),
             'status': 'running',
             'progress': 0,
@@ -110,41 +116,31 @@ class BackgroundExecutor:
         
         try:
             # Use Popen for background execution
-            process = subprocess.Popen(
-                task['command'],
-                shell=True,
-                stdout=subprocess.PIPE,
-                stderr=subprocess.PIPE,
-                text=True,
-                bufsize=1
-            )
+            process = self._spawn(task['command'], task['use_sudo'])
             
             task['process'] = process
             task['pid'] = process.pid
             
             # Read output in real-time
-            output_lines = []
-            while True:
-                # Check if process is done
-                retcode = process.poll()
-                
-                # Read stdout
-                if process.stdout:
-                    line = process.stdout.readline()
-                    if line:
-                        output_lines.append(line)
-                        task['output'] = ''.join(output_lines[-100:])  # Keep last 100 lines
-                
-                # Check stderr
-                if process.stderr:
-                    err_line = process.stderr.readline()
-                    if err_line:
-                        task['error'] += err_line
-                
-                if retcode is not None:
-                    break
-                
-                time.sleep(0.1)
+            output_lines = deque(maxlen=100)  # Keep last 100 lines
+            partial = b''
+            error_decoder = codecs.getincrementaldecoder('utf-8')(errors='replace')
+            for stream, data in self._iter_output(process):
+                if stream == 'stdout':
+                    # Chunks can end mid-line; hold the tail until its newline
+                    lines = (partial + data).split(b'\n')
+                    partial = lines.pop()
+                    # Only decode the lines that survive the 100-line window
+                    output_lines.extend(
+                        line.decode('utf-8', errors='replace') + '\n'
+                        for line in lines[-output_lines.maxlen:]
+                    )
+                    task['output'] = ''.join(output_lines) + partial.decode('utf-8', errors='replace')
+                else:
+                    task['error'] += error_decoder.decode(data)
+            task['error'] += error_decoder.decode(b'', final=True)
+            
+            retcode = process.wait()
             
             # Process completed
             task['status'] = 'completed'
@@ -163,6 +159,73 @@ class BackgroundExecutor:
             task['error'] = str(e)
             task['end_time'] = datetime.now()
     
+    def _spawn(self, command: str, use_sudo: bool) -> subprocess.Popen:
+        """
+        Start a command with piped output
+        
+        With sudo the command runs from an argv list (via ``sh -c`` only when
+        it uses shell syntax) and the cached password is written to stdin, so
+        it never appears on a command line.
+        """
+        if not use_sudo:
+            return subprocess.Popen(
+                command,
+                shell=True,
+                stdout=subprocess.PIPE,
+                stderr=subprocess.PIPE,
+                bufsize=0
+            )
+        
+        if any(ch in _SHELL_METACHARS for ch in command):
+            argv = ['sudo', '-S', 'sh', '-c', command]
+        else:
+            argv = ['sudo', '-S'] + shlex.split(command)
+        
+        process = subprocess.Popen(
+            argv,
+            stdin=subprocess.PIPE,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.PIPE,
+            bufsize=0
+        )
+        try:
+            process.stdin.write(f"{self.sudo_password or ''}\n".encode())
+            process.stdin.close()
+        except BrokenPipeError:
+            pass  # sudo exited before reading the password
+        return process
+    
+    def _iter_output(self, process: subprocess.Popen):
+        """
+        Yield ('stdout' | 'stderr', bytes) chunks as soon as the child writes them
+        
+        Waits on the pipes with a selector (epoll on Linux) instead of polling,
+        and returns once both pipes reach EOF.
+        """
+        selector = selectors.DefaultSelector()
+        
+        for stream, pipe in (('stdout', process.stdout), ('stderr', process.stderr)):
+            if pipe is None:
+                continue
+            fd = pipe.fileno()
+            fcntl.fcntl(fd, fcntl.F_SETFL, fcntl.fcntl(fd, fcntl.F_GETFL) | os.O_NONBLOCK)
+            selector.register(fd, selectors.EVENT_READ, stream)
+        
+        try:
+            while selector.get_map():
+                for key, _ in selector.select(timeout=1.0):
+                    try:
+                        data = os.read(key.fd, 65536)
+                    except BlockingIOError:
+                        continue
+                    
+                    if data:
+                        yield key.data, data
+                    else:
+                        selector.unregister(key.fd)
+        finally:
+            selector.close()
+    
     def get_task_status(self, task_id: str) -> Dict[str, Any]:
         """Get status of a background task"""
         task = self.active_tasks.get(task_id)
@@ -238,35 +301,33 @@ class BackgroundExecutor:
         Returns:
             Final output
         """
-        if use_sudo:
-            if self.is_sudo_valid():
-                command = f"echo '{self.sudo_password}' | sudo -S {command}"
-            else:
-                return "Error: No sudo password cached"
+        if use_sudo and not self.is_sudo_valid():
+            return "Error: No sudo password cached"
         
         progress_callback(0, "Starting...")
         
         try:
-            process = subprocess.Popen(
-                command,
-                shell=True,
-                stdout=subprocess.PIPE,
-                stderr=subprocess.PIPE,
-                text=True
-            )
+            process = self._spawn(command, use_sudo)
             
             output = []
-            while True:
-                line = process.stdout.readline()
-                if line:
-                    output.append(line)
+            partial = b''
+            for stream, data in self._iter_output(process):
+                if stream != 'stdout':
+                    continue
+                lines = (partial + data).split(b'\n')
+                partial = lines.pop()
+                for raw_line in lines:
+                    line = raw_line.decode('utf-8', errors='replace')
+                    output.append(line + '\n')
                     # Update progress based on output patterns
                     progress_callback(50, line.strip()[:100])
-                
-                if process.poll() is not None:
-                    break
-                
-                time.sleep(0.1)
+            
+            if partial:
+                line = partial.decode('utf-8', errors='replace')
+                output.append(line)
+                progress_callback(50, line.strip()[:100])
+            
+            process.wait()
             
             progress_callback(100, "Completed")
             return ''.join(output)
@@ -6,14 +6,12 @@ import subprocess
 import time
 import os
 import re
+import shlex
+from collections import deque
+from types import MappingProxyType
 
-try:
-    import pyautogui
-    pyautogui.FAILSAFE = True
-    PYAUTOGUI_AVAILABLE = True
-except:
-    pyautogui = None
-    PYAUTOGUI_AVAILABLE = False
+# pyautogui is loaded on the first GUI action, shared with full_control
+from bosco_os.capabilities.system.full_control import _ensure_pyautogui
 
 try:
     import pyperclip
@@ -23,18 +21,43 @@ except:
     PYPERCLIP_AVAILABLE = False
 
 
+# Command patterns, compiled once at import. These stay on the stdlib engine:
+# RE2 is much slower on utterance-sized strings and its \w is ASCII-only.
+_OPEN_AND_WRITE_RE = re.compile(r'open\s+(?:the\s+)?(\w+)\s+and\s+(?:write|type)\s+(.+)')
+_OPEN_RE = re.compile(r'open\s+(?:the\s+)?(\w+(?:\s+\w+)?)')
+_WRITE_RE = re.compile(r'(?:write|type)\s+(.+)')
+_RUN_RE = re.compile(r'run\s+(.+)')
+
+
 class EnhancedAutomation:
+    # Settle time after an action before the next one runs (GUI ops only)
+    _POST_DELAY = {
+        'open_app': 0.3,
+        'type_text': 0.05,
+    }
+    
+    # Spoken app name -> executable, shared read-only by all instances
+    _APP_COMMANDS = MappingProxyType({
+        'notepad': 'notepad',
+        'text editor': 'notepad',
+        'terminal': 'gnome-terminal',
+        'cmd': 'cmd',
+        'vscode': 'code',
+        'chrome': 'google-chrome',
+        'browser': 'google-chrome',
+        'firefox': 'firefox',
+    })
+    
     def __init__(self):
-        self.command_history = []
-        self.app_commands = {
-            'notepad': 'notepad',
-            'text editor': 'notepad',
-            'terminal': 'gnome-terminal',
-            'cmd': 'cmd',
-            'vscode': 'code',
-            'chrome': 'google-chrome',
-            'browser': 'google-chrome',
-            'firefox': 'firefox',
+        self.command_history: deque = deque(maxlen=1024)
+        
+        # Action name -> handler; 'wait' only sleeps and yields no result
+        self._dispatch = {
+            'open_app': self.open_app,
+            'wait': time.sleep,
+            'type_text': self.type_text,
+            'run_terminal': self.run_terminal,
+            'screenshot': self.screenshot,
         }
     
     def parse_command(self, command):
@@ -42,28 +65,32 @@ class EnhancedAutomation:
         self.command_history.append(command)
         actions = []
         
-        # Pattern: "open [app] and write [text]"
-        match = re.search(r'open\s+(?:the\s+)?(\w+)\s+and\s+(?:write|type)\s+(.+)', command)
-        if match:
-            actions.append(('open_app', match.group(1)))
-            actions.append(('wait', 1.5))
-            actions.append(('type_text', match.group(2).strip()))
-            return actions
-        
-        # Pattern: "open [app]"
-        match = re.search(r'open\s+(?:the\s+)?(\w+(?:\s+\w+)?)', command)
-        if match and 'write' not in command and 'type' not in command:
-            actions.append(('open_app', match.group(1)))
-            return actions
+        # Only run the unanchored "open" searches when the word is present
+        if 'open' in command:
+            # Pattern: "open [app] and write [text]"
+            match = _OPEN_AND_WRITE_RE.search(command)
+            if match:
+                actions.append(('open_app', match.group(1)))
+                actions.append(('wait', 1.5))
+                actions.append(('type_text', match.group(2).strip()))
+                return actions
+            
+            # Pattern: "open [app]"
+            match = _OPEN_RE.search(command)
+            if match and 'write' not in command and 'type' not in command:
+                actions.append(('open_app', match.group(1)))
+                return actions
         
         # Pattern: "write [text]" or "type [text]"
-        if command.startswith('write ') or command.startswith('type '):
-            actions.append(('type_text', command.replace('write ', '').replace('type ', '').strip()))
+        match = _WRITE_RE.match(command)
+        if match:
+            actions.append(('type_text', match.group(1).strip()))
             return actions
         
         # Pattern: "run [command]"
-        if command.startswith('run '):
-            actions.append(('run_terminal', command.replace('run ', '').strip()))
+        match = _RUN_RE.match(command)
+        if match:
+            actions.append(('run_terminal', match.group(1).strip()))
             return actions
         
         # Screenshot
@@ -74,18 +101,18 @@ class EnhancedAutomation:
     
     def execute_actions(self, actions):
         results = []
-        for action in actions:
-            if action[0] == 'open_app':
-                results.append(self.open_app(action[1]))
-            elif action[0] == 'wait':
-                time.sleep(action[1])
-            elif action[0] == 'type_text':
-                results.append(self.type_text(action[1]))
-            elif action[0] == 'run_terminal':
-                results.append(self.run_terminal(action[1]))
-            elif action[0] == 'screenshot':
-                results.append(self.screenshot())
-            time.sleep(0.3)
+        last = len(actions) - 1
+        for i, action in enumerate(actions):
+            handler = self._dispatch.get(action[0])
+            if handler:
+                result = handler(*action[1:])
+                if result is not None:
+                    results.append(result)
+            
+            # Nothing follows the last action, so it needs no settle time
+            delay = self._POST_DELAY.get(action[0], 0)
+            if delay and i < last:
+                time.sleep(delay)
         return results
     
     def process_command(self, command):
@@ -96,25 +123,26 @@ class EnhancedAutomation:
     
     def open_app(self, app_name):
         app = app_name.lower().strip()
-        cmd = self.app_commands.get(app, app)
+        cmd = self._APP_COMMANDS.get(app, app)
         try:
             if os.name == 'nt':
                 subprocess.Popen(cmd, shell=True)
             else:
-                subprocess.Popen([cmd], stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+                subprocess.Popen(shlex.split(cmd), stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
             return f"Opened {app_name}"
         except Exception as e:
             return f"Error: {e}"
     
     def type_text(self, text):
         try:
+            gui = _ensure_pyautogui()
             if PYPERCLIP_AVAILABLE:
                 pyperclip.copy(text)
-                if PYAUTOGUI_AVAILABLE:
-                    pyautogui.hotkey('ctrl', 'v')
+                if gui:
+                    gui.hotkey('ctrl', 'v')
                 return f"Typed: {text}"
-            elif PYAUTOGUI_AVAILABLE:
-                pyautogui.write(text)
+            elif gui:
+                gui.write(text)
                 return f"Typed: {text}"
             return "No typing available"
         except Exception as e:
@@ -130,20 +158,36 @@ class EnhancedAutomation:
     
     def screenshot(self):
         try:
-            if PYAUTOGUI_AVAILABLE:
+            gui = _ensure_pyautogui()
+            if gui:
                 path = f"{os.path.expanduser('~')}/Pictures/bosco_screenshot_{int(time.time())}.png"
-                pyautogui.screenshot(path)
+                gui.screenshot(path)
                 return f"Saved: {path}"
             return "Not available"
         except Exception as e:
             return f"Error: {e}"
 
 
-automation = EnhancedAutomation()
+_automation = None
+
+
+def get_automation() -> EnhancedAutomation:
+    """Get or create the shared EnhancedAutomation"""
+    global _automation
+    if _automation is None:
+        _automation = EnhancedAutomation()
+    return _automation
+
+
+def __getattr__(name):
+    # PEP 562: `enhanced_automation.automation` is created on first access
+    if name == 'automation':
+        return get_automation()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
 
 
 def process_command(cmd):
-    return automation.process_command(cmd)
+    return get_automation().process_command(cmd)
 
 
 if __name__ == "__main__":
@@ -9,11 +9,41 @@ import subprocess
 import time
 import json
 import re
+import shlex
+import shutil
+import stat
+import fnmatch
+import pwd
+import grp
+import selectors
 from pathlib import Path
-from typing import Dict, List, Optional, Any
+from types import MappingProxyType
+from typing import Dict, List, Optional, Any, Tuple
 import threading
+import asyncio
+from collections import OrderedDict, deque
+from concurrent.futures import ThreadPoolExecutor
 import urllib.request
 import urllib.parse
+import urllib.error
+import gzip
+
+from bosco_os.capabilities.system.spawn import spawn_detached
+
+# Pooled HTTP client with keep-alive
+try:
+    import requests
+    from requests.adapters import HTTPAdapter
+    REQUESTS_AVAILABLE = True
+except ImportError:
+    REQUESTS_AVAILABLE = False
+
+# Concurrent page fetches for search_and_fetch
+try:
+    import aiohttp
+    AIOHTTP_AVAILABLE = True
+except ImportError:
+    AIOHTTP_AVAILABLE = False
 
 # For web scraping
 try:
@@ -22,54 +52,224 @@ try:
 except:
     BS_AVAILABLE = False
 
-# For GUI automation
+# libxml2-backed tree builder for BeautifulSoup, much faster than html.parser
 try:
-    import pyautogui
-    pyautogui.FAILSAFE = True
-    pyautogui.PAUSE = 0.1
-    PYAUTOGUI_AVAILABLE = True
-except:
-    pyautogui = None
-    PYAUTOGUI_AVAILABLE = False
+    import lxml
+    BS_PARSER = 'lxml'
+except ImportError:
+    BS_PARSER = 'html.parser'
+
+# C-level CSS selectors for search result extraction (lexbor)
+try:
+    from selectolax.lexbor import LexborHTMLParser
+    SELECTOLAX_AVAILABLE = True
+except ImportError:
+    SELECTOLAX_AVAILABLE = False
+
+_CHARSET_RE = re.compile(r'charset=["\']?([\w.:-]+)', re.IGNORECASE)
+_WS_RE = re.compile(r'\s+')
+
+# Effective uid can't change under us, so check it once
+_IS_ROOT = hasattr(os, 'geteuid') and os.geteuid() == 0
+
+# Executable name -> absolute path; only hits are kept so newly installed apps are found
+_WHICH_CACHE: Dict[str, str] = {}
+
+
+def _which(cmd: str) -> Optional[str]:
+    """shutil.which, memoized"""
+    path = _WHICH_CACHE.get(cmd)
+    if path is None:
+        path = shutil.which(cmd)
+        if path is not None:
+            _WHICH_CACHE[cmd] = path
+    return path
+
+
+# For GUI automation. pyautogui probes the X display when imported (slow, and it
+# can fail), so it is loaded on the first GUI operation instead of at import.
+_pyautogui = None
+_pyautogui_loaded = False
+
+
+def _ensure_pyautogui():
+    """Import and configure pyautogui on first use; None if unavailable"""
+    global _pyautogui, _pyautogui_loaded
+    if not _pyautogui_loaded:
+        try:
+            import pyautogui
+            pyautogui.FAILSAFE = True
+            pyautogui.PAUSE = 0.1
+            _pyautogui = pyautogui
+        except Exception:
+            _pyautogui = None
+        _pyautogui_loaded = True
+    return _pyautogui
+
 
 try:
     import pyperclip
     PYPERCLIP_AVAILABLE = True
 except:
     pyperclip = None
+    PYPERCLIP_AVAILABLE = False
+
+# Fast XShm screen capture; much quicker than pyautogui's scrot/PIL path
+try:
+    import mss
+    import mss.tools
+    MSS_AVAILABLE = True
+except ImportError:
+    MSS_AVAILABLE = False
+
+# Needed to re-encode screenshots as JPEG
+try:
+    from PIL import Image
+    PIL_AVAILABLE = True
+except ImportError:
+    PIL_AVAILABLE = False
+
+# In-process X11 input (python-libxdo), used when pyautogui is missing
+try:
+    from xdo import Xdo, CURRENTWINDOW
+    XDO_AVAILABLE = True
+except ImportError:
+    XDO_AVAILABLE = False
+
+# Process lookup for close_app
+try:
+    import psutil
+    PSUTIL_AVAILABLE = True
+except ImportError:
+    PSUTIL_AVAILABLE = False
 
 
 class TerminalControl:
     """Execute terminal commands with full system access"""
     
     def __init__(self):
-        self.command_history = []
+        self.command_history: deque = deque(maxlen=1024)
+    
+    @staticmethod
+    def _kill_tree(process: subprocess.Popen):
+        """SIGKILL a child process and everything it started"""
+        descendants = []
+        if PSUTIL_AVAILABLE:
+            try:
+                descendants = psutil.Process(process.pid).children(recursive=True)
+            except psutil.Error:
+                pass
+        process.kill()
+        for child in descendants:
+            try:
+                child.kill()
+            except psutil.Error:
+                pass
+        process.wait()
+    
+    @staticmethod
+    def _pump(pipes: List[tuple], finished, deadline: float, limit: Optional[int] = None) -> str:
+        """
+        Read non-blocking pipes into their bytearrays until finished() is true
         
-    def execute(self, command: str, timeout: int = 30) -> Dict[str, Any]:
-        """Execute a terminal command and return output"""
-        self.command_history.append(command)
+        Returns 'done', 'eof' (every pipe closed), 'timeout', or 'limit'
+        (some buffer holds `limit` bytes).
+        """
+        selector = selectors.DefaultSelector()
+        for pipe, buf in pipes:
+            selector.register(pipe, selectors.EVENT_READ, buf)
+        try:
+            while True:
+                if finished():
+                    return 'done'
+                if not selector.get_map():
+                    return 'eof'
+                if limit is not None and any(len(buf) >= limit for _, buf in pipes):
+                    return 'limit'
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    return 'timeout'
+                for key, _ in selector.select(timeout=remaining):
+                    try:
+                        data = os.read(key.fd, 65536)
+                    except BlockingIOError:
+                        continue
+                    if data:
+                        key.data.extend(data)
+                    else:
+                        selector.unregister(key.fileobj)
+        finally:
+            selector.close()
+    
+    @staticmethod
+    def _result(out: bytes, err: bytes, returncode: Optional[int], max_bytes: Optional[int] = None) -> Dict[str, Any]:
+        """Build the execute() result dict, truncating to max_bytes if given"""
+        result = {
+            'success': True,
+            'stdout': bytes(out[:max_bytes]).decode('utf-8', errors='replace'),
+            'stderr': bytes(err[:max_bytes]).decode('utf-8', errors='replace'),
+            'returncode': returncode
+        }
+        if max_bytes is not None and (len(out) > max_bytes or len(err) > max_bytes):
+            result['truncated'] = True
+        return result
+    
+    def _execute_forked(self, command: str, timeout: int, max_bytes: Optional[int] = None) -> Dict[str, Any]:
+        """Run one command in its own /bin/sh, streaming its output"""
+        process = subprocess.Popen(
+            command,
+            shell=True,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.PIPE,
+            bufsize=0
+        )
+        os.set_blocking(process.stdout.fileno(), False)
+        os.set_blocking(process.stderr.fileno(), False)
         
+        out, err = bytearray(), bytearray()
+        deadline = time.monotonic() + timeout
+        limit = max_bytes + 1 if max_bytes is not None else None
         try:
-            result = subprocess.run(
-                command,
-                shell=True,
-                capture_output=True,
-                text=True,
-                timeout=timeout
+            status = self._pump(
+                [(process.stdout, out), (process.stderr, err)],
+                lambda: False, deadline, limit
             )
+            if status == 'eof':
+                return self._result(out, err, process.wait(max(0, deadline - time.monotonic())), max_bytes)
+            
+            # Over the limit (or out of time): stop the command instead of draining it
+            self._kill_tree(process)
+            if status == 'limit':
+                return self._result(out, err, None, max_bytes)
             return {
-                'success': True,
-                'stdout': result.stdout,
-                'stderr': result.stderr,
-                'returncode': result.returncode
+                'success': False,
+                'error': 'Command timed out',
+                'stdout': '',
+                'stderr': 'Timeout'
             }
         except subprocess.TimeoutExpired:
+            self._kill_tree(process)
             return {
                 'success': False,
                 'error': 'Command timed out',
                 'stdout': '',
                 'stderr': 'Timeout'
             }
+        finally:
+            process.stdout.close()
+            process.stderr.close()
+        
+    def execute(self, command: str, timeout: int = 30, max_bytes: Optional[int] = None) -> Dict[str, Any]:
+        """
+        Execute a terminal command and return output
+        
+        With max_bytes, reading stops once stdout or stderr exceeds that many bytes;
+        the command is killed and the result carries 'truncated': True.
+        """
+        self.command_history.append(command)
+        
+        try:
+            return self._execute_forked(command, timeout, max_bytes)
         except Exception as e:
             return {
                 'success': False,
@@ -80,97 +280,296 @@ class TerminalControl:
     
     def run_background(self, command: str):
         """Run command in background"""
-        subprocess.Popen(
-            command,
-            shell=True,
-            stdout=subprocess.DEVNULL,
-            stderr=subprocess.DEVNULL
-        )
+        spawn_detached(['/bin/sh', '-c', command])
         return f"Running in background: {command}"
     
     def get_output(self, command: str) -> str:
         """Get command output as string"""
-        result = self.execute(command)
+        result = self.execute(command, max_bytes=2000)
         if result['success']:
             output = result['stdout'] or result['stderr']
-            return output[:2000] if output else "Command executed successfully (no output)"
+            return output if output else "Command executed successfully (no output)"
         return f"Error: {result.get('error', 'Unknown error')}"
 
 
 class WebBrowser:
     """Web browsing and scraping capabilities"""
     
+    # Response cache limits (seconds); pages change more often than search/wiki
+    CACHE_MAXSIZE = 512
+    SEARCH_TTL = 3600
+    PAGE_TTL = 300
+    # Largest body kept for ETag/Last-Modified revalidation, and the total
+    # kept; bodies live in their own LRU so they can't crowd out the TTL cache
+    REVALIDATE_MAX_BYTES = 1 << 20
+    REVALIDATE_CACHE_BYTES = 16 << 20
+    
     def __init__(self):
         self.headers = {
             'User-Agent': 'Mozilla/5.0 (X11; Linux x86_64) AppleWebKit/537.36'
         }
+        
+        # One session so repeat requests reuse the TCP/TLS connection
+        self.session = None
+        if REQUESTS_AVAILABLE:
+            self.session = requests.Session()
+            self.session.headers.update(self.headers)
+            adapter = HTTPAdapter(pool_connections=4, pool_maxsize=8)
+            self.session.mount('https://', adapter)
+            self.session.mount('http://', adapter)
+        
+        # LRU of key -> (expires_at, value) so repeat questions skip the network
+        self._cache: OrderedDict = OrderedDict()
+        self._cache_lock = threading.Lock()
+        
+        # LRU of url -> (etag, last_modified, body, content_type), byte-bounded
+        self._validators: OrderedDict = OrderedDict()
+        self._validator_bytes = 0
+    
+    def _cache_get(self, key: tuple) -> Any:
+        """Return a live cached value, or None"""
+        with self._cache_lock:
+            entry = self._cache.get(key)
+            if entry is None:
+                return None
+            if entry[0] < time.monotonic():
+                del self._cache[key]
+                return None
+            self._cache.move_to_end(key)
+            return entry[1]
+    
+    def _cache_put(self, key: tuple, value: Any, ttl: float):
+        """Store a value, evicting the least recently used entry when full"""
+        with self._cache_lock:
+            self._cache[key] = (time.monotonic() + ttl, value)
+            self._cache.move_to_end(key)
+            if len(self._cache) > self.CACHE_MAXSIZE:
+                self._cache.popitem(last=False)
+    
+    def clear_cache(self):
+        """Drop all cached responses"""
+        with self._cache_lock:
+            self._cache.clear()
+            self._validators.clear()
+            self._validator_bytes = 0
+    
+    def _remembered(self, url: str) -> Optional[tuple]:
+        """Return the stored (etag, last_modified, body, content_type) for url, or None"""
+        with self._cache_lock:
+            entry = self._validators.get(url)
+            if entry is not None:
+                self._validators.move_to_end(url)
+            return entry
+    
+    def _remember(self, url: str, headers, body: bytes, content_type: str):
+        """Keep a response's validators and body so the next fetch can be conditional"""
+        etag, modified = headers.get('ETag'), headers.get('Last-Modified')
+        if not (etag or modified) or len(body) > self.REVALIDATE_MAX_BYTES:
+            return
+        with self._cache_lock:
+            old = self._validators.pop(url, None)
+            if old is not None:
+                self._validator_bytes -= len(old[2])
+            self._validators[url] = (etag, modified, body, content_type)
+            self._validator_bytes += len(body)
+            while self._validator_bytes > self.REVALIDATE_CACHE_BYTES:
+                _, evicted = self._validators.popitem(last=False)
+                self._validator_bytes -= len(evicted[2])
+    
+    def _fetch(self, url: str, timeout: int = 10) -> Tuple[bytes, str]:
+        """
+        Fetch (body, content type), through the pooled session when available
+        
+        Revisits send If-None-Match/If-Modified-Since and a 304 reuses the stored body.
+        requests already negotiates gzip/deflate (and br when brotli is installed);
+        the urllib fallback asks for gzip and inflates it itself.
+        """
+        stored = self._remembered(url)
+        conditional = {}
+        if stored is not None:
+            if stored[0]:
+                conditional['If-None-Match'] = stored[0]
+            if stored[1]:
+                conditional['If-Modified-Since'] = stored[1]
+        
+        if self.session is not None:
+            response = self.session.get(url, timeout=timeout, headers=conditional)
+            if response.status_code == 304 and stored is not None:
+                return stored[2], stored[3]
+            response.raise_for_status()
+            content_type = response.headers.get('Content-Type', '')
+            self._remember(url, response.headers, response.content, content_type)
+            return response.content, content_type
+        
+        req = urllib.request.Request(url, headers={**self.headers, 'Accept-Encoding': 'gzip', **conditional})
+        try:
+            with urllib.request.urlopen(req, timeout=timeout) as response:
+                body = response.read()
+                if response.headers.get('Content-Encoding') == 'gzip':
+                    body = gzip.decompress(body)
+                content_type = response.headers.get('Content-Type', '')
+                self._remember(url, response.headers, body, content_type)
+                return body, content_type
+        except urllib.error.HTTPError as e:
+            if e.code == 304 and stored is not None:
+                return stored[2], stored[3]
+            raise
+    
+    @staticmethod
+    def _decode(body: bytes, content_type: str) -> str:
+        """Decode a body once using the declared charset (default UTF-8)"""
+        match = _CHARSET_RE.search(content_type)
+        try:
+            return body.decode(match.group(1) if match else 'utf-8', errors='replace')
+        except LookupError:
+            return body.decode('utf-8', errors='replace')
+    
+    def _fetch_html(self, url: str) -> str:
+        """Fetch a page as text"""
+        return self._decode(*self._fetch(url))
+    
+    @staticmethod
+    def _extract_text(html: str) -> str:
+        """Readable text of a page, whitespace-collapsed and capped at 3000 chars"""
+        if not BS_AVAILABLE:
+            return html[:3000]
+        soup = BeautifulSoup(html, BS_PARSER)
+        # Remove script and style
+        for script in soup(["script", "style"]):
+            script.decompose()
+        text = soup.get_text(separator=' ')
+        # Collapse whitespace runs in one C-level pass
+        return _WS_RE.sub(' ', text).strip()[:3000]
     
     def search(self, query: str, num_results: int = 5) -> List[Dict[str, str]]:
         """Search the web and return results"""
+        key = ('search', query, num_results)
+        cached = self._cache_get(key)
+        if cached is not None:
+            return [dict(item) for item in cached]
+        
         try:
             # Use DuckDuckGo HTML
             url = f"https://html.duckduckgo.com/html/?q={urllib.parse.quote(query)}"
+            html = self._fetch_html(url)
             
-            req = urllib.request.Request(url, headers=self.headers)
-            response = urllib.request.urlopen(req, timeout=10)
-            html = response.read()
-            
-            if BS_AVAILABLE:
-                soup = BeautifulSoup(html, 'html.parser')
-                results = []
-                
-                for result in soup.select('.result__body')[:num_results]:
-                    title_elem = result.select_one('.result__a')
-                    snippet_elem = result.select_one('.result__snippet')
-                    link_elem = result.select_one('.result__url')
-                    
-                    if title_elem:
-                        results.append({
-                            'title': title_elem.get_text(strip=True),
-                            'url': title_elem.get('href', ''),
-                            'snippet': snippet_elem.get_text(strip=True) if snippet_elem else ''
-                        })
-                
-                return results
-            else:
+            results = self._parse_results(html, num_results)
+            if results is None:
                 # Fallback to simple text parsing
                 return [{'title': 'Search results available', 'url': url, 'snippet': 'Install beautifulsoup4 for better results'}]
+            
+            self._cache_put(key, [dict(item) for item in results], self.SEARCH_TTL)
+            return results
                 
         except Exception as e:
             return [{'error': str(e)}]
     
+    @staticmethod
+    def _parse_results(html: str, num_results: int) -> Optional[List[Dict[str, str]]]:
+        """Pull title/url/snippet out of DuckDuckGo HTML; None without a parser"""
+        results = []
+        
+        if SELECTOLAX_AVAILABLE:
+            for result in LexborHTMLParser(html).css('.result__body')[:num_results]:
+                title_elem = result.css_first('.result__a')
+                snippet_elem = result.css_first('.result__snippet')
+                
+                if title_elem:
+                    results.append({
+                        'title': title_elem.text(strip=True),
+                        'url': title_elem.attributes.get('href') or '',
+                        'snippet': snippet_elem.text(strip=True) if snippet_elem else ''
+                    })
+            return results
+        
+        if BS_AVAILABLE:
+            soup = BeautifulSoup(html, BS_PARSER)
+            for result in soup.select('.result__body')[:num_results]:
+                title_elem = result.select_one('.result__a')
+                snippet_elem = result.select_one('.result__snippet')
+                
+                if title_elem:
+                    results.append({
+                        'title': title_elem.get_text(strip=True),
+                        'url': title_elem.get('href', ''),
+                        'snippet': snippet_elem.get_text(strip=True) if snippet_elem else ''
+                    })
+            return results
+        
+        return None
+    
     def get_page_content(self, url: str) -> str:
         """Get content of a webpage"""
+        key = ('page', url)
+        cached = self._cache_get(key)
+        if cached is not None:
+            return cached
+        
         try:
-            req = urllib.request.Request(url, headers=self.headers)
-            response = urllib.request.urlopen(req, timeout=10)
-            html = response.read()
-            
-            if BS_AVAILABLE:
-                soup = BeautifulSoup(html, 'html.parser')
-                # Remove script and style
-                for script in soup(["script", "style"]):
-                    script.decompose()
-                text = soup.get_text()
-                # Clean whitespace
-                lines = (line.strip() for line in text.splitlines())
-                chunks = (phrase.strip() for line in lines for phrase in line.split("  "))
-                text = ' '.join(chunk for chunk in chunks if chunk)
-                return text[:3000]
-            else:
-                return html.decode('utf-8', errors='ignore')[:3000]
+            text = self._extract_text(self._fetch_html(url))
+            self._cache_put(key, text, self.PAGE_TTL)
+            return text
                 
         except Exception as e:
             return f"Error: {str(e)}"
     
+    async def _fetch_page_async(self, session, url: str) -> str:
+        """aiohttp counterpart of get_page_content (shares its cache)"""
+        key = ('page', url)
+        cached = self._cache_get(key)
+        if cached is not None:
+            return cached
+        
+        try:
+            async with session.get(url) as response:
+                response.raise_for_status()
+                body = await response.read()
+                html = self._decode(body, response.headers.get('Content-Type', ''))
+            # Parsing is CPU-bound; keep it off the loop so other fetches proceed
+            text = await asyncio.to_thread(self._extract_text, html)
+            self._cache_put(key, text, self.PAGE_TTL)
+            return text
+        except Exception as e:
+            return f"Error: {str(e)}"
+    
+    async def search_and_fetch(self, query: str, num_results: int = 5) -> List[Dict[str, str]]:
+        """
+        Search, then fetch every result page concurrently
+        
+        Each result gains a 'content' key. Pages are fetched over one aiohttp
+        session when available, otherwise get_page_content runs in threads.
+        """
+        results = await asyncio.to_thread(self.search, query, num_results)
+        results = [r for r in results if r.get('url')]
+        # DuckDuckGo hands back scheme-relative redirect links
+        urls = [urllib.parse.urljoin('https://duckduckgo.com/', r['url']) for r in results]
+        
+        if AIOHTTP_AVAILABLE:
+            connector = aiohttp.TCPConnector(limit=16)
+            timeout = aiohttp.ClientTimeout(total=10)
+            async with aiohttp.ClientSession(headers=self.headers, connector=connector, timeout=timeout) as session:
+                pages = await asyncio.gather(*(self._fetch_page_async(session, url) for url in urls))
+        else:
+            pages = await asyncio.gather(*(asyncio.to_thread(self.get_page_content, url) for url in urls))
+        
+        for result, page in zip(results, pages):
+            result['content'] = page
+        return results
+    
     def get_wikipedia(self, topic: str) -> str:
         """Get Wikipedia summary"""
+        key = ('wikipedia', topic)
+        cached = self._cache_get(key)
+        if cached is not None:
+            return cached
+        
         url = f"https://en.wikipedia.org/api/rest_v1/page/summary/{urllib.parse.quote(topic)}"
         try:
-            req = urllib.request.Request(url, headers=self.headers)
-            response = urllib.request.urlopen(req, timeout=10)
-            data = json.loads(response.read())
-            return f"{data.get('extract', 'No information found')}\n\nSource: Wikipedia"
+            body, _ = self._fetch(url)
+            data = json.loads(body)
+            summary = f"{data.get('extract', 'No information found')}\n\nSource: Wikipedia"
+            self._cache_put(key, summary, self.SEARCH_TTL)
+            return summary
         except Exception as e:
             return f"Error getting Wikipedia: {str(e)}"
 
@@ -178,50 +577,61 @@ class WebBrowser:
 class FullSystemControl:
     """Complete system control - all PC operations"""
     
+    # Application database (spoken name -> command), shared read-only by all instances
+    _APPS = MappingProxyType({
+        # Web browsers
+        'chrome': 'google-chrome',
+        'google chrome': 'google-chrome',
+        'firefox': 'firefox',
+        'brave': 'brave-browser',
+        
+        # Development
+        'vscode': 'code',
+        'vs code': 'code',
+        'visual studio': 'code',
+        'terminal': 'gnome-terminal',
+        'term': 'gnome-terminal',
+        'vim': 'vim',
+        'nano': 'nano',
+        
+        # Communication
+        'discord': 'discord',
+        'slack': 'slack',
+        'teams': 'teams',
+        'zoom': 'zoom',
+        
+        # Media
+        'spotify': 'spotify',
+        'vlc': 'vlc',
+        'music': 'spotify',
+        'video': 'vlc',
+        
+        # Office
+        'libreoffice': 'libreoffice',
+        'office': 'libreoffice',
+        'writer': 'libreoffice --writer',
+        
+        # System tools
+        'files': 'nautilus',
+        'file manager': 'nautilus',
+        'settings': 'gnome-control-center',
+        'preferences': 'gnome-control-center',
+    })
+    
     def __init__(self):
         self.terminal = TerminalControl()
         self.browser = WebBrowser()
+        self._xdo = None
+        # Encodes and writes screenshots so screenshot() returns after capture
+        self._screenshot_writer = None
         
-        # Application database
-        self.apps = {
-            # Web browsers
-            'chrome': 'google-chrome',
-            'google chrome': 'google-chrome',
-            'firefox': 'firefox',
-            'brave': 'brave-browser',
-            
-            # Development
-            'vscode': 'code',
-            'vs code': 'code',
-            'visual studio': 'code',
-            'terminal': 'gnome-terminal',
-            'term': 'gnome-terminal',
-            'vim': 'vim',
-            'nano': 'nano',
-            
-            # Communication
-            'discord': 'discord',
-            'slack': 'slack',
-            'teams': 'teams',
-            'zoom': 'zoom',
-            
-            # Media
-            'spotify': 'spotify',
-            'vlc': 'vlc',
-            'music': 'spotify',
-            'video': 'vlc',
-            
-            # Office
-            'libreoffice': 'libreoffice',
-            'office': 'libreoffice',
-            'writer': 'libreoffice --writer',
-            
-            # System tools
-            'files': 'nautilus',
-            'file manager': 'nautilus',
-            'settings': 'gnome-control-center',
-            'preferences': 'gnome-control-center',
-        }
+        # Resolve the known apps off the startup path
+        threading.Thread(target=self._warm_which_cache, daemon=True).start()
+    
+    def _warm_which_cache(self):
+        """Pre-resolve every command in the app table"""
+        for cmd in set(self._APPS.values()):
+            _which(cmd.split()[0])
     
     # === TERMINAL COMMANDS ===
     def run_command(self, cmd: str) -> str:
@@ -258,47 +668,173 @@ class FullSystemControl:
         """Get Wikipedia info"""
         return self.browser.get_wikipedia(topic)
     
+    def search_and_read(self, query: str, num_results: int = 3) -> str:
+        """
+        Search the web and read the top results (pages fetched in parallel)
+        
+        asyncio.run can't nest, so when called from inside a running event loop
+        the fetch gets its own loop in a worker thread. Async callers should
+        await search_and_read_async instead of blocking their loop.
+        """
+        fetch = lambda: asyncio.run(self.browser.search_and_fetch(query, num_results))
+        try:
+            asyncio.get_running_loop()
+        except RuntimeError:
+            results = fetch()
+        else:
+            with ThreadPoolExecutor(max_workers=1) as executor:
+                results = executor.submit(fetch).result()
+        return self._format_read_results(query, results)
+    
+    async def search_and_read_async(self, query: str, num_results: int = 3) -> str:
+        """Awaitable search_and_read for code already inside an event loop"""
+        results = await self.browser.search_and_fetch(query, num_results)
+        return self._format_read_results(query, results)
+    
+    @staticmethod
+    def _format_read_results(query: str, results: List[Dict[str, str]]) -> str:
+        """Render search_and_fetch results for search_and_read"""
+        if not results:
+            return "No results found."
+        
+        output = f"🔍 Search results for '{query}':\n\n"
+        for i, r in enumerate(results, 1):
+            output += f"{i}. {r.get('title', 'N/A')}\n"
+            output += f"   URL: {r.get('url', 'N/A')}\n"
+            output += f"   {r.get('content', '')[:500]}\n\n"
+        
+        return output
+    
     # === APPLICATION CONTROL ===
     def open_app(self, app_name: str) -> str:
         """Open any application"""
-        app_cmd = self.apps.get(app_name.lower(), app_name)
+        app_cmd = self._APPS.get(app_name.lower(), app_name)
         
-        try:
-            subprocess.Popen(
-                app_cmd.split(),
-                stdout=subprocess.DEVNULL,
-                stderr=subprocess.DEVNULL
-            )
-            return f"✅ Opened: {app_name}"
-        except Exception as e:
-            # Try as generic command
+        # Mapped command first, then the name as a generic command
+        error = "not installed"
+        for cmd in (app_cmd, app_name):
+            try:
+                argv = shlex.split(cmd)
+            except ValueError:
+                argv = cmd.split()  # unbalanced quotes
+            path = _which(argv[0]) if argv else None
+            if path is None:
+                continue
             try:
-                subprocess.Popen(
-                    app_name.split(),
-                    stdout=subprocess.DEVNULL,
-                    stderr=subprocess.DEVNULL
-                )
+                spawn_detached([path] + argv[1:])
                 return f"✅ Opened: {app_name}"
-            except:
-                return f"❌ Could not open {app_name}: {str(e)}"
+            except OSError as e:
+                _WHICH_CACHE.pop(argv[0], None)
+                error = str(e)
+        return f"❌ Could not open {app_name}: {error}"
     
     def close_app(self, app_name: str) -> str:
         """Close any application"""
-        result = self.terminal.execute(f"pkill -f '{app_name}'")
-        if result['success']:
+        if not PSUTIL_AVAILABLE:
+            # argv, not a shell string: the name can't inject commands
+            try:
+                result = subprocess.run(['pkill', '-f', '--', app_name], capture_output=True, timeout=5)
+                if result.returncode == 0:
+                    return f"✅ Closed: {app_name}"
+            except (OSError, subprocess.TimeoutExpired):
+                pass
+            return f"❌ Could not close {app_name}"
+        
+        # Same matching as `pkill -f`: process name or full command line
+        closed = 0
+        for proc in psutil.process_iter(['pid', 'name', 'cmdline']):
+            if proc.info['pid'] == os.getpid():
+                continue
+            cmdline = ' '.join(proc.info['cmdline'] or [])
+            if app_name in (proc.info['name'] or '') or app_name in cmdline:
+                try:
+                    proc.terminate()
+                    closed += 1
+                except (psutil.NoSuchProcess, psutil.AccessDenied):
+                    pass
+        
+        if closed:
             return f"✅ Closed: {app_name}"
         return f"❌ Could not close {app_name}"
     
     # === FILE OPERATIONS ===
+    @staticmethod
+    def _format_entry(name: str, st: os.stat_result, full_path: str, owners: Dict[int, str], groups: Dict[int, str]) -> str:
+        """One `ls -l` style line"""
+        if st.st_uid not in owners:
+            try:
+                owners[st.st_uid] = pwd.getpwuid(st.st_uid).pw_name
+            except KeyError:
+                owners[st.st_uid] = str(st.st_uid)
+        if st.st_gid not in groups:
+            try:
+                groups[st.st_gid] = grp.getgrgid(st.st_gid).gr_name
+            except KeyError:
+                groups[st.st_gid] = str(st.st_gid)
+        
+        line = (f"{stat.filemode(st.st_mode)} {st.st_nlink:>3} {owners[st.st_uid]:<8} {groups[st.st_gid]:<8} "
+                f"{st.st_size:>10} {time.strftime('%b %d %H:%M', time.localtime(st.st_mtime))} {name}")
+        if stat.S_ISLNK(st.st_mode):
+            try:
+                line += f" -> {os.readlink(full_path)}"
+            except OSError:
+                pass
+        return line
+    
     def list_files(self, path: str = ".") -> str:
         """List files in directory"""
-        return self.terminal.get_output(f"ls -la {path}")
+        path = os.path.expanduser(path)
+        owners, groups = {}, {}
+        try:
+            if not os.path.isdir(path):
+                return self._format_entry(path, os.lstat(path), path, owners, groups)
+            with os.scandir(path) as it:
+                entries = sorted(it, key=lambda e: e.name.lower())
+            lines = []
+            for entry in entries:
+                try:
+                    st = entry.stat(follow_symlinks=False)
+                except OSError:
+                    continue
+                lines.append(self._format_entry(entry.name, st, entry.path, owners, groups))
+            return "\n".join(lines) if lines else "Directory is empty"
+        except OSError as e:
+            return f"Error: {e}"
     
-    def find_file(self, name: str, path: str = "/home") -> str:
+    def find_file(self, name: str, path: str = "/home", limit: int = 20) -> str:
         """Find files by name"""
-        result = self.terminal.execute(f"find {path} -name '*{name}*' 2>/dev/null | head -20")
-        if result['success'] and result['stdout']:
-            return f"📁 Found files:\n{result['stdout']}"
+        # Same matching as `find -name '*name*'`, stopping as soon as we have enough
+        if any(c in name for c in '*?['):
+            pattern = f"*{name}*"
+            matches = lambda n: fnmatch.fnmatchcase(n, pattern)
+        else:
+            matches = lambda n: name in n
+        
+        hits = []
+        # Depth-first scandir walk: names are tested as getdents returns them and
+        # d_type answers is_dir() without a stat, so no per-directory lists are built
+        stack = [os.path.expanduser(path)]
+        while stack:
+            try:
+                it = os.scandir(stack.pop())
+            except OSError:
+                continue  # unreadable, like find's 2>/dev/null
+            subdirs = []
+            with it:
+                for entry in it:
+                    if matches(entry.name):
+                        hits.append(entry.path)
+                        if len(hits) >= limit:
+                            return "📁 Found files:\n" + "\n".join(hits)
+                    try:
+                        if entry.is_dir(follow_symlinks=False):
+                            subdirs.append(entry.path)
+                    except OSError:
+                        pass
+            stack.extend(reversed(subdirs))
+        
+        if hits:
+            return "📁 Found files:\n" + "\n".join(hits)
         return "No files found."
     
     def read_file(self, filepath: str) -> str:
@@ -329,24 +865,24 @@ class FullSystemControl:
     # === SYSTEM INFO ===
     def system_info(self) -> str:
         """Get system information"""
-        info = []
-        
-        # CPU
-        result = self.terminal.execute("top -bn1 | head -5")
-        info.append(f"🖥️ CPU:\n{result['stdout'][:200]}")
-        
-        # Memory
-        result = self.terminal.execute("free -h")
-        info.append(f"💾 Memory:\n{result['stdout']}")
-        
-        # Disk
-        result = self.terminal.execute("df -h")
-        info.append(f"💿 Disk:\n{result['stdout']}")
+        commands = {
+            'cpu': "top -bn1 | head -5",
+            'mem': "free -h",
+            'disk': "df -h",
+            'net': "ip addr",
+        }
         
-        # Network
-        result = self.terminal.execute("ip addr")
-        info.append(f"🌐 Network:\n{result['stdout'][:300]}")
+        # The commands are independent, so run them side by side
+        with ThreadPoolExecutor(max_workers=len(commands)) as executor:
+            futures = {k: executor.submit(self.terminal.execute, c) for k, c in commands.items()}
+            out = {k: f.result()['stdout'] for k, f in futures.items()}
         
+        info = [
+            f"🖥️ CPU:\n{out['cpu'][:200]}",
+            f"💾 Memory:\n{out['mem']}",
+            f"💿 Disk:\n{out['disk']}",
+            f"🌐 Network:\n{out['net'][:300]}",
+        ]
         return "\n\n".join(info)
     
     def processes(self) -> str:
@@ -355,19 +891,53 @@ class FullSystemControl:
         return f"📊 Top Processes:\n\n{result['stdout']}"
     
     # === SCREEN CONTROL ===
-    def screenshot(self) -> str:
-        """Take screenshot"""
-        path = f"/home/tradler/Pictures/screenshot_{int(time.time())}.png"
-        if PYAUTOGUI_AVAILABLE:
+    @staticmethod
+    def _write_screenshot(image, path: str):
+        """Encode and save a captured frame (runs on the writer thread)"""
+        try:
+            if not hasattr(image, 'save'):
+                # Raw mss frame: PNG straight from its buffer, JPEG through PIL
+                if not path.endswith('.jpg'):
+                    mss.tools.to_png(image.rgb, image.size, level=1, output=path)
+                    return
+                image = Image.frombytes('RGB', image.size, image.rgb)
+            
+            if path.endswith('.jpg'):
+                image.convert('RGB').save(path, 'JPEG', quality=80)
+            else:
+                # zlib level 1: most of PNG's time is compression, little of its size
+                image.save(path, optimize=False, compress_level=1)
+        except Exception as e:
+            print(f"[FullControl] Screenshot write failed: {e}")
+    
+    def screenshot(self, fmt: str = 'png') -> str:
+        """Take screenshot; capture is synchronous, encoding and writing happen in the background"""
+        ext = 'jpg' if fmt.lower() in ('jpg', 'jpeg') and PIL_AVAILABLE else 'png'
+        path = f"/home/tradler/Pictures/screenshot_{int(time.time())}.{ext}"
+        
+        image = None
+        if MSS_AVAILABLE:
+            try:
+                with mss.mss() as sct:
+                    image = sct.grab(sct.monitors[0])
+            except Exception:
+                image = None
+        gui = _ensure_pyautogui() if image is None else None
+        if gui:
             try:
-                pyautogui.screenshot(path)
-                return f"📸 Screenshot saved: {path}"
+                image = gui.screenshot()
             except Exception as e:
                 return f"Error: {str(e)}"
         
+        if image is not None:
+            if self._screenshot_writer is None:
+                self._screenshot_writer = ThreadPoolExecutor(max_workers=1)
+            self._screenshot_writer.submit(self._write_screenshot, image, path)
+            return f"📸 Screenshot saved: {path}"
+        
         # Fallback
         result = self.terminal.execute(f"scrot {path}")
-        if result['success']:
+        if result['success'] and result['returncode'] == 0:
             return f"📸 Screenshot saved: {path}"
         return "Could not take screenshot"
     
@@ -377,8 +947,14 @@ class FullSystemControl:
         if PYPERCLIP_AVAILABLE:
             return f"📋 Clipboard: {pyperclip.paste()}"
         
-        result = self.terminal.execute("xclip -selection clipboard -o")
-        return f"📋 Clipboard: {result['stdout'][:500]}"
+        try:
+            result = subprocess.run(
+                ['xclip', '-selection', 'clipboard', '-o'],
+                capture_output=True, text=True, timeout=5
+            )
+            return f"📋 Clipboard: {result.stdout[:500]}"
+        except Exception as e:
+            return f"Error: {str(e)}"
     
     def set_clipboard(self, text: str) -> str:
         """Set clipboard content"""
@@ -386,56 +962,103 @@ class FullSystemControl:
             pyperclip.copy(text)
             return "✅ Copied to clipboard"
         
-        self.terminal.run_background(f"echo '{text}' | xclip -selection clipboard")
-        return "✅ Copied to clipboard"
+        try:
+            # xclip keeps serving the selection, so hand it the text and move on
+            proc = subprocess.Popen(
+                ['xclip', '-selection', 'clipboard'],
+                stdin=subprocess.PIPE,
+                stdout=subprocess.DEVNULL,
+                stderr=subprocess.DEVNULL
+            )
+            proc.stdin.write(text.encode())
+            proc.stdin.close()
+            return "✅ Copied to clipboard"
+        except Exception as e:
+            return f"Error: {str(e)}"
     
     # === KEYBOARD/MOUSE ===
+    def _get_xdo(self):
+        """Open the libxdo X11 connection on first use; None if unavailable"""
+        if self._xdo is None and XDO_AVAILABLE:
+            try:
+                self._xdo = Xdo()
+            except Exception:
+                return None
+        return self._xdo
+    
+    def _xdotool(self, *args: str) -> bool:
+        """Run xdotool directly from an argv list (no intermediate shell)"""
+        path = _which('xdotool')
+        if path is None:
+            return False
+        try:
+            spawn_detached([path, *args])
+            return True
+        except OSError:
+            return False
+    
     def type_text(self, text: str) -> str:
         """Type text"""
-        if PYAUTOGUI_AVAILABLE:
-            pyautogui.write(text)
+        gui = _ensure_pyautogui()
+        if gui:
+            gui.write(text)
             return f"✅ Typed: {text}"
         
         # Fallback
-        self.terminal.run_background(f"xdotool type '{text}'")
+        xdo = self._get_xdo()
+        if xdo:
+            xdo.enter_text_window(CURRENTWINDOW, text.encode())
+        elif not self._xdotool('type', '--', text):
+            return "❌ No typing backend (install pyautogui or xdotool)"
         return f"✅ Typed: {text}"
     
     def press_key(self, key: str) -> str:
         """Press a key"""
-        if PYAUTOGUI_AVAILABLE:
-            pyautogui.press(key)
+        gui = _ensure_pyautogui()
+        if gui:
+            gui.press(key)
             return f"✅ Pressed: {key}"
         
-        self.terminal.run_background(f"xdotool key {key}")
+        xdo = self._get_xdo()
+        if xdo:
+            xdo.send_keysequence_window(CURRENTWINDOW, key.encode())
+        elif not self._xdotool('key', key):
+            return "❌ No keyboard backend (install pyautogui or xdotool)"
         return f"✅ Pressed: {key}"
     
     def click(self, x: int = None, y: int = None) -> str:
         """Click at position"""
-        if PYAUTOGUI_AVAILABLE:
+        gui = _ensure_pyautogui()
+        if gui:
             if x and y:
-                pyautogui.click(x, y)
+                gui.click(x, y)
             else:
-                pyautogui.click()
+                gui.click()
             pos = f" at {x},{y}" if x and y else ""
             return f"✅ Clicked{pos}"
         
-        if x and y:
-            self.terminal.run_background(f"xdotool mousemove {x} {y} click 1")
+        xdo = self._get_xdo()
+        if xdo:
+            if x and y:
+                xdo.move_mouse(x, y)
+            xdo.click_window(CURRENTWINDOW, 1)
         else:
-            self.terminal.run_background("xdotool click 1")
+            args = ('mousemove', str(x), str(y), 'click', '1') if x and y else ('click', '1')
+            if not self._xdotool(*args):
+                return "❌ No mouse backend (install pyautogui or xdotool)"
         return "✅ Clicked"
     
     # === SPECIAL OPERATIONS ===
     def install_package(self, package: str) -> str:
         """Install a package (apt)"""
-        if os.geteuid() != 0:
+        if not _IS_ROOT:
             return "Need sudo. Try: sudo apt install " + package
         result = self.terminal.execute(f"sudo apt install -y {package}")
         return f"📦 Installation result:\n{result['stdout'][:500]}"
     
     def update_system(self) -> str:
         """Update system packages"""
-        if os.geteuid() != 0:
+        if not _IS_ROOT:
             return "Need sudo. Try: sudo apt update"
         result = self.terminal.execute("sudo apt update")
         return f"🔄 Update result:\n{result['stdout'][:500]}"
@@ -458,79 +1081,94 @@ class FullSystemControl:
         return f"❌ Error: {result.get('stderr', 'Unknown')}"
 
 
-# Global instance
-system = FullSystemControl()
+# Global instance, built on first use (see get_system / __getattr__)
+_system = None
+
+
+def get_system() -> FullSystemControl:
+    """Get or create the shared FullSystemControl"""
+    global _system
+    if _system is None:
+        _system = FullSystemControl()
+    return _system
+
+
+def __getattr__(name: str):
+    # PEP 562: keep `full_control.system` working without constructing it at import
+    if name == 'system':
+        return get_system()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
 
 
 # Quick access functions
 def run_command(cmd: str) -> str:
-    return system.run_command(cmd)
+    return get_system().run_command(cmd)
 
 def search_web(query: str) -> str:
-    return system.search_web(query)
+    return get_system().search_web(query)
 
 def browse_url(url: str) -> str:
-    return system.browse_url(url)
+    return get_system().browse_url(url)
 
 def wikipedia(topic: str) -> str:
-    return system.wikipedia(topic)
+    return get_system().wikipedia(topic)
 
 def open_app(app: str) -> str:
-    return system.open_app(app)
+    return get_system().open_app(app)
 
 def close_app(app: str) -> str:
-    return system.close_app(app)
+    return get_system().close_app(app)
 
 def list_files(path: str = ".") -> str:
-    return system.list_files(path)
+    return get_system().list_files(path)
 
 def find_file(name: str) -> str:
-    return system.find_file(name)
+    return get_system().find_file(name)
 
 def read_file(filepath: str) -> str:
-    return system.read_file(filepath)
+    return get_system().read_file(filepath)
 
 def create_file(filepath: str, content: str) -> str:
-    return system.create_file(filepath, content)
+    return get_system().create_file(filepath, content)
 
 def delete_file(filepath: str) -> str:
-    return system.delete_file(filepath)
+    return get_system().delete_file(filepath)
 
 def system_info() -> str:
-    return system.system_info()
+    return get_system().system_info()
 
 def processes() -> str:
-    return system.processes()
+    return get_system().processes()
 
 def screenshot() -> str:
-    return system.screenshot()
+    return get_system().screenshot()
 
 def get_clipboard() -> str:
-    return system.get_clipboard()
+    return get_system().get_clipboard()
 
 def set_clipboard(text: str) -> str:
-    return system.set_clipboard(text)
+    return get_system().set_clipboard(text)
 
 def type_text(text: str) -> str:
-    return system.type_text(text)
+    return get_system().type_text(text)
 
 def press_key(key: str) -> str:
-    return system.press_key(key)
+    return get_system().press_key(key)
 
 def click(x: int = None, y: int = None) -> str:
-    return system.click(x, y)
+    return get_system().click(x, y)
 
 def install_package(package: str) -> str:
-    return system.install_package(package)
+    return get_system().install_package(package)
 
 def update_system() -> str:
-    return system.update_system()
+    return get_system().update_system()
 
 def git_clone(repo_url: str) -> str:
-    return system.git_clone(repo_url)
+    return get_system().git_clone(repo_url)
 
 def download_file(url: str) -> str:
-    return system.download_file(url)
+    return get_system().download_file(url)
 
 
 if __name__ == "__main__":
@@ -538,6 +1176,6 @@ if __name__ == "__main__":
     
     # Test web search
     print("\nTesting web search...")
-    results = system.search_web("Python programming")
+    results = get_system().search_web("Python programming")
     print(results[:500])
 
@@ -4,12 +4,123 @@ Navigate PC and Web like humans do - click, scroll, select, browse
 """
 
 import os
+import platform
+import shutil
 import subprocess
 import time
 import re
+import queue
+import random
+import functools
+import threading
+import contextlib
+from concurrent.futures import Future
 from typing import Dict, Any, Optional, List, Tuple
 from datetime import datetime
 
+from bosco_os.capabilities.system.spawn import spawn_detached
+
+# Template matching for find_and_click / wait_for_image (SIMD matchTemplate)
+try:
+    import cv2
+    import numpy as np
+    CV2_AVAILABLE = True
+except ImportError:
+    CV2_AVAILABLE = False
+
+# In-process XTest input over one persistent display connection (no xdotool fork)
+try:
+    from Xlib import X, XK, display as xdisplay
+    from Xlib.ext import xtest
+    XLIB_AVAILABLE = True
+except ImportError:
+    XLIB_AVAILABLE = False
+
+# XShm screen grabs straight into a BGRA buffer (no PIL image per frame)
+try:
+    import mss
+    MSS_AVAILABLE = True
+except ImportError:
+    MSS_AVAILABLE = False
+
+
+# `xdotool getmouselocation` output: "x:123 y:456 screen:0 window:..."
+_MOUSE_RE = re.compile(r'x:(\d+)\s+y:(\d+)')
+
+# An xdotool that doesn't answer within this (no display, wedged X server) won't
+# answer at all; actions get it on top of the time their own delays take
+_XDO_TIMEOUT = 0.2
+
+# Pointer path sampling: one step per 10ms of requested movement time
+_MOVE_STEP = 0.01
+
+
+def _bezier(start: Tuple[int, int], end: Tuple[int, int], n: int) -> List[Tuple[int, int]]:
+    """
+    Up to n points along a cubic Bezier from start to end (start excluded)
+    
+    The two control points are pushed randomly off the straight line and the
+    curve is sampled with ease-in/ease-out, so the pointer arcs and slows down
+    near both ends like a hand would.
+    """
+    (x0, y0), (x3, y3) = start, end
+    dx, dy = x3 - x0, y3 - y0
+    spread = max(abs(dx), abs(dy)) * 0.25
+    x1, y1 = x0 + dx / 3 + random.uniform(-spread, spread), y0 + dy / 3 + random.uniform(-spread, spread)
+    x2, y2 = x0 + 2 * dx / 3 + random.uniform(-spread, spread), y0 + 2 * dy / 3 + random.uniform(-spread, spread)
+    
+    points = []
+    for i in range(1, n + 1):
+        t = i / n
+        t = t * t * (3 - 2 * t)
+        u = 1 - t
+        a, b, c, d = u * u * u, 3 * u * u * t, 3 * u * t * t, t * t * t
+        point = (round(a * x0 + b * x1 + c * x2 + d * x3), round(a * y0 + b * y1 + c * y2 + d * y3))
+        if i == n:
+            point = (x3, y3)
+        if not points or point != points[-1]:
+            points.append(point)
+    return points
+
+
+def _operand(arg: str) -> str:
+    """
+    Make a leading '-' read as a path rather than an option
+    
+    xdg-open rejects every dash argument, '--' included, so the argument is
+    prefixed with ./ instead.
+    """
+    return f"./{arg}" if arg.startswith('-') else arg
+
+
+def _backgroundable(method):
+    """Let an action run on the navigator's worker thread when called with async_=True"""
+    @functools.wraps(method)
+    def wrapper(self, *args, async_: bool = False, **kwargs):
+        if async_:
+            return self._submit(method, self, *args, **kwargs)
+        return method(self, *args, **kwargs)
+    return wrapper
+
+
+# Same for every instance; platform.system() also works where os.uname is missing
+_PLATFORM = platform.system()
+
+
+# Tool availability is fixed for the life of the process; probed once and shared
+_DEPS_CACHE: Optional[Dict[str, bool]] = None
+_DEPS_ATTRS = frozenset(('_pag', 'has_pyautogui', '_xdpy', 'has_xlib', 'has_xdotool', 'has_selenium'))
+
+# The shared Xlib display isn't thread-safe; one gesture at a time goes through it
+_XLIB_LOCK = threading.Lock()
+
+# pyautogui-style key names to X keysym names
+_KEYSYM_ALIASES = {
+    'ctrl': 'Control_L', 'control': 'Control_L', 'alt': 'Alt_L', 'shift': 'Shift_L',
+    'super': 'Super_L', 'win': 'Super_L', 'enter': 'Return', 'esc': 'Escape',
+    'del': 'Delete', 'pageup': 'Prior', 'pagedown': 'Next',
+}
+
 
 class HumanNavigator:
     """
@@ -18,65 +129,270 @@ class HumanNavigator:
     """
 
     def __init__(self):
-        self.platform = os.uname().sysname
+        self.platform = _PLATFORM
         self.last_click_position = None
+        self._screen_size: Optional[Tuple[int, int]] = None
+        self._browser_cmd: Optional[str] = None  # '' once we know none is installed
+        self._templates: Dict[str, Any] = {}  # image name -> (gray, gray downsampled 4x)
+        self._sct_local = threading.local()  # mss handles are bound to their thread
         
-        # Check available tools
-        self.has_pyautogui = False
-        self.has_xdotool = False
-        self.has_selenium = False
-        self._check_dependencies()
+        # Fire-and-forget actions: one queue, one worker, so they run in call order
+        self._actions: queue.Queue = queue.Queue()
+        self._worker: Optional[threading.Thread] = None
+        self._worker_lock = threading.Lock()
+        self._batch_local = threading.local()  # per-thread xdotool command buffer
+        
+        # Available tools (_pag, has_pyautogui, _xdpy, has_xlib, has_xdotool,
+        # has_selenium) are checked on first access, see __getattr__
+    
+    def __getattr__(self, name):
+        # Only reached for attributes not set yet: probe the tools on first use
+        if name in _DEPS_ATTRS:
+            self._check_dependencies()
+            return self.__dict__[name]
+        raise AttributeError(f"{type(self).__name__!r} object has no attribute {name!r}")
     
     def _check_dependencies(self):
         """Check what automation tools are available"""
-        try:
-            import pyautogui
-            self.has_pyautogui = True
-        except:
-            pass
-        
-        # Check xdotool
-        result = subprocess.run('which xdotool', shell=True, capture_output=True)
-        self.has_xdotool = result.returncode == 0
-        
-        # Check selenium
-        try:
-            from selenium import webdriver
-            self.has_selenium = True
-        except:
-            pass
+        global _DEPS_CACHE
+        if _DEPS_CACHE is None:
+            deps = {'_pag': None, 'has_pyautogui': False, '_xdpy': None, 'has_xlib': False,
+                    'has_xdotool': False, 'has_selenium': False}
+            
+            try:
+                import pyautogui
+                deps['_pag'] = pyautogui  # the pyautogui module, bound once
+                deps['has_pyautogui'] = True
+            except:
+                pass
+            
+            # Open the X display once; the XTest calls reuse this connection
+            if XLIB_AVAILABLE:
+                try:
+                    dpy = xdisplay.Display()
+                    if dpy.has_extension('XTEST'):
+                        deps['_xdpy'] = dpy
+                        deps['has_xlib'] = True
+                    else:
+                        dpy.close()
+                except Exception:
+                    pass
+            
+            # Check xdotool
+            deps['has_xdotool'] = shutil.which('xdotool') is not None
+            
+            # Check selenium
+            try:
+                from selenium import webdriver
+                deps['has_selenium'] = True
+            except:
+                pass
+            
+            _DEPS_CACHE = deps
+        self.__dict__.update(_DEPS_CACHE)
+    
+    def refresh(self):
+        """Re-probe tools and screen size (after installing tools or a display change)"""
+        global _DEPS_CACHE
+        _DEPS_CACHE = None
+        self._check_dependencies()
+        self.invalidate_screen_size()
+        self._browser_cmd = None
 
-    def _run_cmd(self, cmd: str) -> str:
-        """Run shell command"""
+    def _run_argv(self, argv: List[str], timeout: float = _XDO_TIMEOUT) -> str:
+        """Run a command from an argv list (no shell) and return its output"""
         try:
             result = subprocess.run(
-                cmd,
-                shell=True,
+                argv,
+                stdin=subprocess.DEVNULL,
                 capture_output=True,
                 text=True,
-                timeout=30
+                timeout=timeout
             )
             return result.stdout + result.stderr
-        except:
+        except (OSError, subprocess.TimeoutExpired):
             return ""
 
+    def _submit(self, fn, *args, **kwargs) -> Future:
+        """Queue fn for the worker thread and return a Future for its result"""
+        with self._worker_lock:
+            if self._worker is None:
+                self._worker = threading.Thread(target=self._drain, name="HumanNavigator", daemon=True)
+                self._worker.start()
+        future = Future()
+        self._actions.put((future, fn, args, kwargs))
+        return future
+    
+    def _drain(self):
+        """Worker loop: run queued actions one after another"""
+        while True:
+            future, fn, args, kwargs = self._actions.get()
+            try:
+                if future.set_running_or_notify_cancel():
+                    try:
+                        future.set_result(fn(*args, **kwargs))
+                    except Exception as e:
+                        future.set_exception(e)
+            finally:
+                self._actions.task_done()
+    
+    def wait_idle(self):
+        """Block until every queued background action has run"""
+        self._actions.join()
+
+    def _xdotool(self, *commands: Tuple[Any, ...]) -> bool:
+        """
+        Run one or more xdotool commands in a single process
+        
+        xdotool chains commands given back to back on its command line, so a
+        whole gesture (move, press, move, release) costs one fork instead of
+        one per step. `type` swallows the rest of the line, so it goes last.
+        Inside batch() the commands are buffered instead.
+        """
+        pending = getattr(self._batch_local, 'commands', None)
+        if pending is not None:
+            pending.extend(commands)
+            if commands and commands[-1][0] == 'type':
+                # Nothing can be chained after a type; send what we have
+                self._batch_local.commands = []
+                return self._xdotool_run(pending)
+            return True
+        return self._xdotool_run(commands)
+    
+    def _xdotool_run(self, commands) -> bool:
+        """Execute chained xdotool commands now"""
+        if not commands:
+            return True
+        argv = ['xdotool']
+        for command in commands:
+            argv.extend(str(arg) for arg in command)
+        try:
+            result = subprocess.run(
+                argv,
+                stdin=subprocess.DEVNULL,
+                stdout=subprocess.DEVNULL,
+                stderr=subprocess.DEVNULL,
+                timeout=_XDO_TIMEOUT + self._xdotool_duration(commands)
+            )
+            return result.returncode == 0
+        except (OSError, subprocess.TimeoutExpired):
+            return False
+    
+    @staticmethod
+    def _xdotool_duration(commands) -> float:
+        """Seconds the chained commands spend in their own sleeps and delays"""
+        total = 0.0
+        for command in commands:
+            args = [str(arg) for arg in command]
+            delay = float(args[args.index('--delay') + 1]) / 1000 if '--delay' in args else 0.0
+            if args[0] == 'sleep':
+                total += float(args[1])
+            elif args[0] == 'type':
+                total += delay * len(args[-1])
+            elif '--repeat' in args:
+                total += delay * int(args[args.index('--repeat') + 1])
+        return total
+    
+    def _batching(self) -> bool:
+        """Whether xdotool commands on this thread are being buffered"""
+        return getattr(self._batch_local, 'commands', None) is not None
+    
+    def _in_process(self) -> bool:
+        """Whether actions go straight to the display rather than through xdotool"""
+        return self._pag is not None or self._xdpy is not None
+    
+    def _xlib_keycode(self, key: str) -> int:
+        """Keycode typing key without modifiers, or 0 (leave it to xdotool)"""
+        name = _KEYSYM_ALIASES.get(key.lower(), key)
+        keysym = XK.string_to_keysym(name)
+        if not keysym and len(name) == 1:
+            keysym = ord(name)  # Latin-1 keysyms equal their code point
+        code = self._xdpy.keysym_to_keycode(keysym) if keysym else 0
+        # Shifted symbols (e.g. 'A', '!') need the xdotool path, which adds Shift
+        if code and self._xdpy.keycode_to_keysym(code, 0) != keysym:
+            return 0
+        return code
+    
+    def _xlib_keys(self, keys) -> bool:
+        """Hold keys down in order and release in reverse, via XTest"""
+        codes = [self._xlib_keycode(key) for key in keys]
+        if not all(codes):
+            return False
+        with _XLIB_LOCK:
+            for code in codes:
+                xtest.fake_input(self._xdpy, X.KeyPress, code)
+            for code in reversed(codes):
+                xtest.fake_input(self._xdpy, X.KeyRelease, code)
+            self._xdpy.sync()
+        return True
+    
+    @contextlib.contextmanager
+    def batch(self):
+        """
+        Coalesce the xdotool actions in a with-block into one xdotool process
+        
+            with nav.batch():
+                nav.click(100, 200)
+                nav.type_text("hi")
+                nav.press_key("Return")
+        
+        Actions return their usual status strings but only reach the screen
+        when the block exits (a type_text flushes early, since xdotool can't
+        chain past it). The pyautogui backend acts immediately as before.
+        """
+        if self._batching():
+            yield  # nested: the outer block flushes
+            return
+        self._batch_local.commands = []
+        try:
+            yield
+        finally:
+            pending = self._batch_local.commands
+            self._batch_local.commands = None
+            self._xdotool_run(pending)
+
     # === MOUSE OPERATIONS (Human-like) ===
     
+    @_backgroundable
     def move_mouse(self, x: int, y: int, duration: float = 0.5) -> str:
         """Move mouse to position with human-like speed"""
-        if self.has_pyautogui:
-            import pyautogui
-            pyautogui.moveTo(x, y, duration=duration)
-            self.last_click_position = (x, y)
-            return f"Moved mouse to ({x}, {y})"
+        if not self._in_process() and not self.has_xdotool:
+            return "No mouse control available"
         
-        if self.has_xdotool:
-            self._run_cmd(f"xdotool mousemove {x} {y}")
-            self.last_click_position = (x, y)
-            return f"Moved mouse to ({x}, {y})"
+        steps = int(duration / _MOVE_STEP)
+        if self._batching() and not self._in_process() and self.last_click_position:
+            # Buffered moves haven't happened yet, so the pointer isn't where they end
+            start = self.last_click_position
+        else:
+            start = tuple(self.get_cursor_position())
+        path = _bezier(start, (x, y), steps) if steps > 1 else [(x, y)]
         
-        return "No mouse control available"
+        if self._pag is not None:
+            # Public moveTo keeps the FAILSAFE corner check; _pause=False skips PAUSE per step
+            for i, (px, py) in enumerate(path):
+                if i:
+                    time.sleep(_MOVE_STEP)
+                self._pag.moveTo(px, py, _pause=False)
+        elif self._xdpy is not None:
+            for i, (px, py) in enumerate(path):
+                if i:
+                    time.sleep(_MOVE_STEP)
+                with _XLIB_LOCK:
+                    xtest.fake_input(self._xdpy, X.MotionNotify, x=px, y=py)
+                    self._xdpy.sync()
+        else:
+            # The whole path in one xdotool process, paced by its own sleep command
+            commands = []
+            for px, py in path:
+                if commands:
+                    commands.append(('sleep', _MOVE_STEP))
+                commands.append(('mousemove', px, py))
+            self._xdotool(*commands)
+        
+        self.last_click_position = (x, y)
+        return f"Moved mouse to ({x}, {y})"
     
+    @_backgroundable
     def click(self, x: Optional[int] = None, y: Optional[int] = None, 
               button: str = 'left', double: bool = False) -> str:
         """
@@ -93,102 +409,122 @@ class HumanNavigator:
         clicks = 2 if double else 1
         btn = button
         
-        if self.has_pyautogui:
-            import pyautogui
+        if self._pag is not None:
             for _ in range(clicks):
-                pyautogui.click(button=btn)
+                self._pag.click(button=btn)
                 time.sleep(0.1)
             return f"Clicked {button} at ({x}, {y})" if x else f"Clicked {button}"
         
+        code = {'left': 1, 'middle': 2, 'right': 3}.get(button, 1)
+        
+        if self._xdpy is not None:
+            for i in range(clicks):
+                if i:
+                    time.sleep(0.1)
+                with _XLIB_LOCK:
+                    xtest.fake_input(self._xdpy, X.ButtonPress, code)
+                    xtest.fake_input(self._xdpy, X.ButtonRelease, code)
+                    self._xdpy.sync()
+            return f"Clicked {button}"
+        
         if self.has_xdotool:
-            cmd = f"xdotool click 1"  # left
-            if button == 'right':
-                cmd = f"xdotool click 3"
-            elif button == 'middle':
-                cmd = f"xdotool click 2"
-            
-            if double:
-                cmd += " && xdotool click 1"
-            
-            self._run_cmd(cmd)
+            self._xdotool(('click', '--repeat', clicks, code))
             return f"Clicked {button}"
         
         return "No click control available"
     
-    def double_click(self, x: Optional[int] = None, y: Optional[int] = None) -> str:
-        """Double click"""
-        return self.click(x, y, double=True)
-    
-    def right_click(self, x: Optional[int] = None, y: Optional[int] = None) -> str:
-        """Right click"""
-        return self.click(x, y, button='right')
+    # Fixed-argument variants are bound with partialmethod: no extra Python frame per call
+    double_click = functools.partialmethod(click, double=True)
+    right_click = functools.partialmethod(click, button='right')
     
+    @_backgroundable
     def drag(self, start_x: int, start_y: int, end_x: int, end_y: int) -> str:
         """Drag from one position to another"""
-        if self.has_pyautogui:
-            import pyautogui
-            pyautogui.moveTo(start_x, start_y)
-            pyautogui.mouseDown()
-            pyautogui.moveTo(end_x, end_y, duration=0.5)
-            pyautogui.mouseUp()
+        if self._pag is not None:
+            # dragTo presses, tweens and releases as one call
+            self._pag.moveTo(start_x, start_y)
+            self._pag.dragTo(end_x, end_y, duration=0.5, button='left')
             return f"Dragged from ({start_x}, {start_y}) to ({end_x}, {end_y})"
         
         if self.has_xdotool:
-            self._run_cmd(f"xdotool mousemove {start_x} {start_y}")
-            self._run_cmd("xdotool mousedown 1")
-            self._run_cmd(f"xdotool mousemove {end_x} {end_y}")
-            self._run_cmd("xdotool mouseup 1")
+            # One process, events back to back; --sync so the release lands at the end point
+            self._xdotool(
+                ('mousemove', start_x, start_y),
+                ('mousedown', 1),
+                ('mousemove', '--sync', end_x, end_y),
+                ('mouseup', 1)
+            )
             return f"Dragged from ({start_x}, {start_y}) to ({end_x}, {end_y})"
         
         return "No drag control available"
     
+    @_backgroundable
     def hover(self, x: int, y: int, duration: float = 1.0) -> str:
         """Hover over position"""
         self.move_mouse(x, y)
-        time.sleep(duration)
+        if not self._in_process() and self._batching():
+            self._xdotool(('sleep', duration))
+        else:
+            time.sleep(duration)
         return f"Hovered at ({x}, {y}) for {duration}s"
     
     # === KEYBOARD OPERATIONS (Human-like) ===
     
+    @_backgroundable
     def type_text(self, text: str, delay: float = 0.05) -> str:
         """Type text with slight delays (human-like)"""
-        if self.has_pyautogui:
-            import pyautogui
-            pyautogui.write(text, interval=delay)
+        if self._pag is not None:
+            self._pag.write(text, interval=delay)
             return f"Typed: {text}"
         
         if self.has_xdotool:
-            # Escape special characters
-            text = text.replace("'", "\\'")
-            self._run_cmd(f"xdotool type '{text}'")
+            # xdotool spaces the keystrokes itself (--delay is in ms)
+            self._xdotool(('type', '--delay', int(delay * 1000), '--', text))
             return f"Typed: {text}"
         
         return "No keyboard control available"
     
+    @_backgroundable
     def press_key(self, key: str) -> str:
         """Press a key"""
-        if self.has_pyautogui:
-            import pyautogui
-            pyautogui.press(key)
+        if self._pag is not None:
+            self._pag.press(key)
+            return f"Pressed: {key}"
+        
+        # "ctrl+a" style combos are split here; xdotool parses them itself
+        if self._xdpy is not None and self._xlib_keys(key.split('+') if len(key) > 1 else [key]):
             return f"Pressed: {key}"
         
         if self.has_xdotool:
-            self._run_cmd(f"xdotool key {key}")
+            self._xdotool(('key', key))
             return f"Pressed: {key}"
         
         return "No key control available"
     
+    @_backgroundable
     def press_keys(self, *keys) -> str:
         """Press multiple keys together (e.g., ctrl+c)"""
         combo = '+'.join(keys)
-        return self.press_key(combo)
+        if self._pag is not None:
+            # pyautogui.press would take "ctrl+c" as one (unknown) key name
+            self._pag.hotkey(*keys)
+            return f"Pressed: {combo}"
+        
+        if self._xdpy is not None and self._xlib_keys(keys):
+            return f"Pressed: {combo}"
+        
+        if self.has_xdotool:
+            # xdotool parses the ctrl+c form itself
+            self._xdotool(('key', combo))
+            return f"Pressed: {combo}"
+        
+        return "No key control available"
     
-    def hotkey(self, *keys) -> str:
-        """Press hotkey combination"""
-        return self.press_keys(*keys)
+    hotkey = press_keys
     
     # === SCROLL OPERATIONS (Human-like) ===
     
+    @_backgroundable
     def scroll(self, clicks: int, x: Optional[int] = None, y: Optional[int] = None) -> str:
         """
         Scroll up or down
@@ -200,85 +536,79 @@ class HumanNavigator:
         if x is not None and y is not None:
             self.move_mouse(x, y)
         
-        if self.has_pyautogui:
-            import pyautogui
-            pyautogui.scroll(clicks)
+        if self._pag is not None:
+            self._pag.scroll(clicks)
             direction = "up" if clicks > 0 else "down"
             return f"Scrolled {direction} {abs(clicks)} clicks"
         
         if self.has_xdotool:
             # 4 = up, 5 = down for xdotool
             button = 4 if clicks > 0 else 5
-            for _ in range(abs(clicks)):
-                self._run_cmd(f"xdotool click {button}")
+            # xdotool repeats the click itself; 10ms apart like separate wheel notches
+            self._xdotool(('click', '--repeat', abs(clicks), '--delay', 10, button))
             direction = "up" if clicks > 0 else "down"
             return f"Scrolled {direction} {abs(clicks)} clicks"
         
         return "No scroll control available"
     
-    def scroll_up(self, clicks: int = 3) -> str:
-        """Scroll up"""
-        return self.scroll(clicks)
+    def scroll_up(self, clicks: int = 3, **kwargs) -> str:
+        """Scroll up (keyword arguments, e.g. async_, go to scroll)"""
+        return self.scroll(clicks, **kwargs)
     
-    def scroll_down(self, clicks: int = 3) -> str:
-        """Scroll down"""
-        return self.scroll(-clicks)
+    def scroll_down(self, clicks: int = 3, **kwargs) -> str:
+        """Scroll down (keyword arguments, e.g. async_, go to scroll)"""
+        return self.scroll(-clicks, **kwargs)
     
-    def page_up(self) -> str:
-        """Page up"""
-        return self.press_key('Prior')
-    
-    def page_down(self) -> str:
-        """Page down"""
-        return self.press_key('Next')
+    page_up = functools.partialmethod(press_key, 'Prior')
+    page_down = functools.partialmethod(press_key, 'Next')
     
     # === SELECTION OPERATIONS ===
     
-    def select_all(self) -> str:
-        """Select all (Ctrl+A)"""
-        return self.hotkey('ctrl', 'a')
-    
-    def copy(self) -> str:
-        """Copy (Ctrl+C)"""
-        return self.hotkey('ctrl', 'c')
-    
-    def paste(self) -> str:
-        """Paste (Ctrl+V)"""
-        return self.hotkey('ctrl', 'v')
+    select_all = functools.partialmethod(press_keys, 'ctrl', 'a')
+    copy = functools.partialmethod(press_keys, 'ctrl', 'c')
+    paste = functools.partialmethod(press_keys, 'ctrl', 'v')
+    cut = functools.partialmethod(press_keys, 'ctrl', 'x')
     
-    def cut(self) -> str:
-        """Cut (Ctrl+X)"""
-        return self.hotkey('ctrl', 'x')
-    
-    def select_text(self, start_x: int, start_y: int, end_x: int, end_y: int) -> str:
-        """Select text by dragging"""
-        return self.drag(start_x, start_y, end_x, end_y)
+    # Select text by dragging
+    select_text = drag
     
     # === WINDOW OPERATIONS ===
     
     def get_screen_size(self) -> Tuple[int, int]:
-        """Get screen dimensions"""
-        if self.has_pyautogui:
-            import pyautogui
-            return pyautogui.size()
+        """Get screen dimensions (queried once, then cached)"""
+        if self._screen_size is not None:
+            return self._screen_size
+        
+        if self._pag is not None:
+            self._screen_size = tuple(self._pag.size())
+            return self._screen_size
         
         if self.has_xdotool:
-            output = self._run_cmd("xdotool getdisplaygeometry")
-            parts = output.strip().split()
+            output = self._run_argv(['xdotool', 'getdisplaygeometry'])
+            parts = output.split(None, 2)
             if len(parts) >= 2:
-                return (int(parts[0]), int(parts[1]))
+                self._screen_size = (int(parts[0]), int(parts[1]))
+                return self._screen_size
         
         return (1920, 1080)  # Default
     
+    def invalidate_screen_size(self):
+        """Forget the cached screen size (e.g. after a resolution change)"""
+        self._screen_size = None
+    
     def get_cursor_position(self) -> Tuple[int, int]:
         """Get current cursor position"""
-        if self.has_pyautogui:
-            import pyautogui
-            return pyautogui.position()
+        if self._pag is not None:
+            return self._pag.position()
+        
+        if self._xdpy is not None:
+            with _XLIB_LOCK:
+                pointer = self._xdpy.screen().root.query_pointer()
+            return (pointer.root_x, pointer.root_y)
         
         if self.has_xdotool:
-            output = self._run_cmd("xdotool getmouselocation")
-            match = re.search(r'x:(\d+)\s+y:(\d+)', output)
+            output = self._run_argv(['xdotool', 'getmouselocation'])
+            match = _MOUSE_RE.search(output)
             if match:
                 return (int(match.group(1)), int(match.group(2)))
         
@@ -287,43 +617,39 @@ class HumanNavigator:
     def open_window(self, app: str) -> str:
         """Open a window (app)"""
         # Use xdg-open for generic opening
-        result = self._run_cmd(f"xdg-open {app} &")
+        try:
+            spawn_detached(['xdg-open', _operand(app)])
+        except OSError:
+            return f"Could not open: {app}"
         return f"Opened: {app}"
     
-    def close_window(self) -> str:
-        """Close current window (Alt+F4)"""
-        return self.hotkey('alt', 'f4')
-    
-    def minimize_window(self) -> str:
-        """Minimize current window"""
-        return self.hotkey('super', 'down')
-    
-    def maximize_window(self) -> str:
-        """Maximize current window"""
-        return self.hotkey('super', 'up')
-    
-    def switch_window(self) -> str:
-        """Switch to next window (Alt+Tab)"""
-        return self.hotkey('alt', 'tab')
+    close_window = functools.partialmethod(press_keys, 'alt', 'f4')
+    minimize_window = functools.partialmethod(press_keys, 'super', 'down')
+    maximize_window = functools.partialmethod(press_keys, 'super', 'up')
+    switch_window = functools.partialmethod(press_keys, 'alt', 'tab')
     
     # === WEB NAVIGATION ===
     
     def open_browser(self, url: str = "https://google.com") -> str:
         """Open web browser"""
-        browsers = ['firefox', 'google-chrome', 'brave-browser', 'chromium']
+        if self._browser_cmd is None:
+            # Resolved once with shutil.which (no `which` fork per candidate)
+            self._browser_cmd = ''
+            for browser in ('firefox', 'google-chrome', 'brave-browser', 'chromium'):
+                path = shutil.which(browser)
+                if path:
+                    self._browser_cmd = path
+                    break
         
-        for browser in browsers:
-            result = subprocess.run(
-                f"which {browser}",
-                shell=True,
-                capture_output=True
-            )
-            if result.returncode == 0:
-                self._run_cmd(f"{browser} '{url}' &")
-                return f"Opened {browser} with {url}"
+        # argv, not a shell string, so the URL can't break out into a command
+        argv = [self._browser_cmd or 'xdg-open', _operand(url)]
+        try:
+            spawn_detached(argv)
+        except OSError:
+            return f"Could not open browser for {url}"
         
-        # Fallback to xdg-open
-        self._run_cmd(f"xdg-open '{url}'")
+        if self._browser_cmd:
+            return f"Opened {os.path.basename(self._browser_cmd)} with {url}"
         return f"Opened browser with {url}"
     
     def navigate_to(self, url: str) -> str:
@@ -347,18 +673,89 @@ class HumanNavigator:
     
     # === COMMON HUMAN WORKFLOWS ===
     
+    def _load_template(self, image_name: str):
+        """Grayscale template plus its 4x-downsampled copy, read from disk once"""
+        if image_name not in self._templates:
+            path = f"images/{image_name}.png"
+            full = cv2.imread(path, cv2.IMREAD_GRAYSCALE) if os.path.exists(path) else None
+            if full is None:
+                return None
+            self._templates[image_name] = (full, cv2.pyrDown(cv2.pyrDown(full)))
+        return self._templates[image_name]
+    
+    def _can_locate(self) -> bool:
+        """Whether _locate has both a matcher and a way to grab the screen"""
+        return CV2_AVAILABLE and (MSS_AVAILABLE or self._pag is not None)
+    
+    def _grab_gray(self):
+        """Current screen as a grayscale array"""
+        if MSS_AVAILABLE:
+            sct = getattr(self._sct_local, 'sct', None)
+            if sct is None:
+                sct = self._sct_local.sct = mss.mss()
+            # monitors[0] is the whole root window, the same space pyautogui/xdotool click in
+            return cv2.cvtColor(np.asarray(sct.grab(sct.monitors[0])), cv2.COLOR_BGRA2GRAY)
+        return cv2.cvtColor(np.asarray(self._pag.screenshot()), cv2.COLOR_RGB2GRAY)
+    
+    @staticmethod
+    def _match(screen, template, confidence: float) -> Optional[Tuple[int, int]]:
+        """Top-left of the best TM_CCOEFF_NORMED match scoring >= confidence"""
+        if screen.shape[0] < template.shape[0] or screen.shape[1] < template.shape[1]:
+            return None
+        scores = cv2.matchTemplate(screen, template, cv2.TM_CCOEFF_NORMED)
+        _, best, _, loc = cv2.minMaxLoc(scores)
+        return loc if best >= confidence else None
+    
+    def _locate(self, image_name: str, confidence: float = 0.9) -> Optional[Tuple[int, int]]:
+        """
+        Center of image_name on screen, or None
+        
+        Matches at quarter resolution first (16x less work), then confirms at
+        full resolution only in a small window around the coarse hit.
+        """
+        template = self._load_template(image_name)
+        if template is None:
+            return None
+        full, coarse = template
+        h, w = full.shape
+        screen = self._grab_gray()
+        
+        if min(coarse.shape) < 8:
+            # Too small to survive downsampling; match at full resolution
+            loc = self._match(screen, full, confidence)
+        else:
+            small = cv2.pyrDown(cv2.pyrDown(screen))
+            hit = self._match(small, coarse, confidence - 0.15)
+            if hit is None:
+                return None
+            pad = 16
+            x0, y0 = max(hit[0] * 4 - pad, 0), max(hit[1] * 4 - pad, 0)
+            roi = screen[y0:y0 + h + 2 * pad, x0:x0 + w + 2 * pad]
+            loc = self._match(roi, full, confidence)
+            if loc is not None:
+                loc = (loc[0] + x0, loc[1] + y0)
+        
+        if loc is None:
+            return None
+        return (loc[0] + w // 2, loc[1] + h // 2)
+    
     def find_and_click(self, image_name: str) -> str:
         """Find image on screen and click it (if screenshot available)"""
-        if not self.has_pyautogui:
+        if not self._can_locate() and self._pag is None:
             return "Image recognition not available"
         
         try:
-            import pyautogui
-            location = pyautogui.locateOnScreen(f"images/{image_name}.png")
-            if location:
-                center = pyautogui.center(location)
-                self.click(center.x, center.y)
-                return f"Found and clicked {image_name}"
+            if self._can_locate():
+                center = self._locate(image_name)
+                if center:
+                    self.click(*center)
+                    return f"Found and clicked {image_name}"
+            else:
+                location = self._pag.locateOnScreen(f"images/{image_name}.png")
+                if location:
+                    center = self._pag.center(location)
+                    self.click(center.x, center.y)
+                    return f"Found and clicked {image_name}"
         except:
             pass
         
@@ -366,13 +763,21 @@ class HumanNavigator:
     
     def wait_for_image(self, image_name: str, timeout: int = 10) -> bool:
         """Wait for image to appear on screen"""
-        if not self.has_pyautogui:
+        if not self._can_locate() and self._pag is None:
             return False
         
         try:
-            import pyautogui
-            location = pyautogui.locateOnScreen(f"images/{image_name}.png", timeout=timeout)
-            return location is not None
+            if not self._can_locate():
+                location = self._pag.locateOnScreen(f"images/{image_name}.png", timeout=timeout)
+                return location is not None
+            
+            deadline = time.monotonic() + timeout
+            while True:
+                if self._locate(image_name) is not None:
+                    return True
+                if time.monotonic() >= deadline:
+                    return False
+                time.sleep(0.05)
         except:
             return False
     
@@ -409,6 +814,7 @@ class HumanNavigator:
             'screen_size': {'width': width, 'height': height},
             'tools': {
                 'pyautogui': self.has_pyautogui,
+                'xlib': self.has_xlib,
                 'xdotool': self.has_xdotool,
                 'selenium': self.has_selenium
             }
@@ -417,12 +823,15 @@ class HumanNavigator:
 
 # Global instance
 _navigator = None
+_navigator_lock = threading.Lock()
 
 def get_human_navigator() -> HumanNavigator:
     """Get human navigator instance"""
     global _navigator
     if _navigator is None:
-        _navigator = HumanNavigator()
+        with _navigator_lock:
+            if _navigator is None:
+                _navigator = HumanNavigator()
     return _navigator
 
 
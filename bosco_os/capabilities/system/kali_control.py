@@ -4,58 +4,154 @@ Advanced Linux system control with Kali-specific capabilities
 """
 
 import os
+import grp
+import pwd
+import shutil
 import sys
+import time
 import subprocess
-import platform
 import socket
+import importlib.util
 import re
-from typing import Dict, Any, List, Optional
+import collections
+import heapq
+import operator
+import functools
+from typing import Dict, Any, List, Optional, Tuple, Union
 from datetime import datetime
 
-try:
-    import psutil
-    PSUTIL_AVAILABLE = True
-except ImportError:
-    PSUTIL_AVAILABLE = False
+# psutil loads its C extension and probes /proc on import; only do that when
+# a method actually needs it
+PSUTIL_AVAILABLE = importlib.util.find_spec('psutil') is not None
+_psutil = None
+
+
+def _get_psutil():
+    """Import psutil on first use"""
+    global _psutil
+    if _psutil is None:
+        import psutil
+        _psutil = psutil
+    return _psutil
+
+
+# /proc/<pid>/cmdline is NUL-separated; shown on one line like `pgrep -a` does
+_CMDLINE_SEPS = bytes.maketrans(b'\0\n', b'  ')
+
+
+@functools.lru_cache(maxsize=1)
+def _detect_kali() -> bool:
+    """Detect if running on Kali Linux (checked once per process)"""
+    # Check os-release
+    try:
+        with open('/etc/os-release', 'rb') as f:
+            if b'kali' in f.read().lower():
+                return True
+    except OSError:
+        pass
+    
+    # Check for Kali-specific files
+    if os.path.exists('/usr/bin/kali'):
+        return True
+    
+    # Check kernel version for Kali indicators
+    try:
+        with open('/proc/version', 'rb') as f:
+            return b'kali' in f.read().lower()
+    except OSError:
+        return False
+
+
+# /proc/net socket tables: (ss netid, address family, path)
+_PROC_NET_TABLES = (
+    ('tcp', socket.AF_INET, '/proc/net/tcp'),
+    ('tcp', socket.AF_INET6, '/proc/net/tcp6'),
+    ('udp', socket.AF_INET, '/proc/net/udp'),
+    ('udp', socket.AF_INET6, '/proc/net/udp6'),
+)
+# Kernel socket state codes (include/net/tcp_states.h), named the way ss names them
+_TCP_STATES = {
+    '01': 'ESTAB', '02': 'SYN-SENT', '03': 'SYN-RECV', '04': 'FIN-WAIT-1',
+    '05': 'FIN-WAIT-2', '06': 'TIME-WAIT', '07': 'CLOSE', '08': 'CLOSE-WAIT',
+    '09': 'LAST-ACK', '0A': 'LISTEN', '0B': 'CLOSING',
+}
+_UDP_STATES = {'01': 'ESTAB', '07': 'UNCONN'}
+
+
+def _proc_net_addr(family: int, hex_addr: str) -> str:
+    """'0100007F:0035' -> '127.0.0.1:53' (addresses are little-endian 32-bit words, port 0 is *)"""
+    host, port = hex_addr.split(':')
+    raw = bytes.fromhex(host)
+    raw = b''.join(raw[i:i + 4][::-1] for i in range(0, len(raw), 4))
+    ip = socket.inet_ntop(family, raw)
+    if family == socket.AF_INET6:
+        ip = f'[{ip}]'
+    return f"{ip}:{int(port, 16) or '*'}"
+
+
+# Upper bound on log lines returned by one call
+_MAX_LOG_LINES = 10000
+
+
+def _clamp_log_lines(lines) -> int:
+    """Requested log line count limited to 1.._MAX_LOG_LINES"""
+    return max(1, min(int(lines), _MAX_LOG_LINES))
+
+
+# Not real files: skipped when walking the tree for large files
+_PSEUDO_FS_DIRS = frozenset(('/proc', '/sys', '/dev', '/run'))
+
+
+def _human_size(size: int) -> str:
+    """Bytes as ls -h style text (e.g. 1.5G)"""
+    for unit in ('B', 'K', 'M', 'G', 'T'):
+        if size < 1024 or unit == 'T':
+            return f"{size:.1f}{unit}" if unit != 'B' else f"{size}B"
+        size /= 1024
+
+
+# list_processes table layout
+_PROC_HEADER = f"{'PID':<8} {'USER':<15} {'CPU%':<8} {'MEM%':<8} {'NAME':<30}"
+_PROC_ROW = "{:<8} {:<15} {:<8.1f} {:<8.1f} {:<30}".format
 
 
 class KaliLinuxControl:
     """Advanced Linux control with Kali-specific features"""
     
     def __init__(self):
+        import platform
         self.platform = platform.system()
         self.is_linux = self.platform == "Linux"
-        self.is_kali = self._detect_kali()
+        self.is_kali = _detect_kali()
         self.hostname = socket.gethostname()
+        # (monotonic time, {pid: utime+stime ticks}) from the last process listing
+        self._last_cpu_snapshot: Optional[tuple] = None
+        self._usernames: Dict[int, str] = {}
+        # /proc/stat counters from the last cpu_info (taken now, so the first call has a baseline)
+        self._prev_stat: Optional[List[Tuple[int, int]]] = None
+        if self.is_linux:
+            try:
+                self._prev_stat = self._read_proc_stat()
+            except OSError:
+                pass
+        # Network tools don't come and go while we run; pick once
+        self._net_tool = 'ip' if shutil.which('ip') else 'ifconfig'
+        self._sock_tool = 'ss' if shutil.which('ss') else 'netstat'
         
-    def _detect_kali(self) -> bool:
-        """Detect if running on Kali Linux"""
-        try:
-            # Check os-release
-            if os.path.exists('/etc/os-release'):
-                with open('/etc/os-release') as f:
-                    content = f.read()
-                    if 'Kali' in content or 'kali' in content:
-                        return True
-            
-            # Check for Kali-specific files
-            if os.path.exists('/usr/bin/kali'):
-                return True
-                
-            # Check kernel version for Kali indicators
-            with open('/proc/version', 'r') as f:
-                if 'kali' in f.read().lower():
-                    return True
-                    
-        except:
-            pass
-        return False
-    
-    def _run_command(self, cmd: str, shell: bool = True, timeout: int = 30) -> Dict[str, Any]:
-        """Run a shell command and return result"""
+    def _run_command(self, cmd: Union[str, List[str]], shell: bool = True, timeout: int = 30) -> Dict[str, Any]:
+        """
+        Run a command and return result
+        
+        An argv list is executed directly (no /bin/sh in between, nothing
+        for the shell to interpret); a string still goes through the shell.
+        """
+        if isinstance(cmd, list):
+            shell = False
+        elif not shell:
+            cmd = cmd.split()
         try:
             result = subprocess.run(
-                cmd if shell else cmd.split(),
+                cmd,
                 shell=shell,
                 capture_output=True,
                 text=True,
@@ -84,28 +180,23 @@ class KaliLinuxControl:
             'distro': 'Kali Linux' if self.is_kali else 'Linux'
         }
         
-        # Uptime
-        try:
-            with open('/proc/uptime', 'r') as f:
-                uptime_seconds = float(f.readline().split()[0])
-                days = int(uptime_seconds // 86400)
-                hours = int((uptime_seconds % 86400) // 3600)
-                minutes = int((uptime_seconds % 3600) // 60)
-                info['uptime'] = f"{days}d {hours}h {minutes}m"
-        except:
+        # Uptime: CLOCK_BOOTTIME counts from boot, suspend included (as /proc/uptime)
+        if hasattr(time, 'CLOCK_BOOTTIME'):
+            uptime_seconds = time.clock_gettime(time.CLOCK_BOOTTIME)
+            days = int(uptime_seconds // 86400)
+            hours = int((uptime_seconds % 86400) // 3600)
+            minutes = int((uptime_seconds % 3600) // 60)
+            info['uptime'] = f"{days}d {hours}h {minutes}m"
+        else:
             info['uptime'] = 'Unknown'
         
         # Current user
         info['current_user'] = os.environ.get('USER', 'Unknown')
         
-        # Load average (Linux only)
-        if self.is_linux:
-            try:
-                with open('/proc/loadavg', 'r') as f:
-                    load = f.read().split()[:3]
-                    info['load_average'] = f"{load[0]} (1m), {load[1]} (5m), {load[2]} (15m)"
-            except:
-                pass
+        # Load average (libc getloadavg, no /proc read)
+        if hasattr(os, 'getloadavg'):
+            load1, load5, load15 = os.getloadavg()
+            info['load_average'] = f"{load1:.2f} (1m), {load5:.2f} (5m), {load15:.2f} (15m)"
         
         return info
     
@@ -124,34 +215,118 @@ class KaliLinuxControl:
     
     # ============ Process Management ============
     
-    def list_processes(self, top: int = 10, sort_by: str = 'cpu') -> str:
-        """List top processes"""
+    def _username(self, uid: int) -> str:
+        """User name for uid, resolved once"""
+        name = self._usernames.get(uid)
+        if name is None:
+            try:
+                name = pwd.getpwuid(uid).pw_name
+            except KeyError:
+                name = str(uid)
+            self._usernames[uid] = name
+        return name
+    
+    @staticmethod
+    def _scan_proc():
+        """
+        Yield (pid, comm, stat fields after comm, DirEntry) for each process
+        
+        One read of /proc/<pid>/stat per process; processes that exit
+        mid-scan are skipped.
+        """
+        for entry in os.scandir('/proc'):
+            if not entry.name.isdigit():
+                continue
+            try:
+                with open(f'/proc/{entry.name}/stat', 'rb') as f:
+                    data = f.read()
+            except OSError:
+                continue
+            # comm may contain spaces and parentheses; it ends at the last ") "
+            head, rest = data.rsplit(b') ', 1)
+            yield int(entry.name), head.split(b'(', 1)[1].decode('utf-8', 'replace'), rest.split(), entry
+    
+    def _fast_process_list(self) -> List[Dict[str, Any]]:
+        """
+        pid/name/username/cpu%/mem% for every process, straight from /proc
+        
+        One read of /proc/<pid>/stat and one stat() of the directory (its
+        owner) per process. CPU% is the share of one core used since the
+        previous call, so the first call reports 0.0 like psutil does.
+        """
+        ticks_per_sec = os.sysconf('SC_CLK_TCK')
+        page_size = os.sysconf('SC_PAGE_SIZE')
+        mem_total = os.sysconf('SC_PHYS_PAGES') * page_size
+        
+        now = time.monotonic()
+        prev_time, prev_ticks = self._last_cpu_snapshot or (now, {})
+        elapsed = (now - prev_time) * ticks_per_sec
+        ticks = {}
+        processes = []
+        
+        for pid, comm, fields, entry in self._scan_proc():
+            try:
+                uid = entry.stat().st_uid
+            except OSError:
+                continue  # exited meanwhile
+            
+            used = int(fields[11]) + int(fields[12])  # utime + stime
+            ticks[pid] = used
+            
+            cpu = 0.0
+            if elapsed > 0 and pid in prev_ticks:
+                cpu = (used - prev_ticks[pid]) / elapsed * 100
+            
+            processes.append({
+                'pid': pid,
+                'name': comm,
+                'username': self._username(uid),
+                'cpu_percent': cpu,
+                'memory_percent': int(fields[21]) * page_size / mem_total * 100,
+            })
+        
+        self._last_cpu_snapshot = (now, ticks)
+        return processes
+    
+    def _psutil_process_list(self) -> List[Dict[str, Any]]:
+        """Same rows as _fast_process_list, via psutil (non-Linux)"""
+        psutil = _get_psutil()
         processes = []
-        for proc in psutil.process_iter(['pid', 'name', 'cpu_percent', 'memory_percent', 'username']):
+        # psutil >= 6.0 no longer re-checks every PID for reuse while iterating
+        for proc in psutil.process_iter(['pid', 'name', 'username']):
             try:
-                pinfo = proc.info
+                # One read of /proc/<pid>/stat etc. for both percentages
+                with proc.oneshot():
+                    pinfo = proc.info
+                    pinfo['cpu_percent'] = proc.cpu_percent(None)
+                    pinfo['memory_percent'] = proc.memory_percent()
                 processes.append(pinfo)
-            except:
+            except psutil.Error:
                 pass
+        return processes
+    
+    def list_processes(self, top: int = 10, sort_by: str = 'cpu') -> str:
+        """List top processes"""
+        if self.is_linux:
+            processes = self._fast_process_list()
+        else:
+            processes = self._psutil_process_list()
         
         # Sort
-        if sort_by == 'cpu':
-            processes.sort(key=lambda x: x.get('cpu_percent', 0), reverse=True)
-        else:
-            processes.sort(key=lambda x: x.get('memory_percent', 0), reverse=True)
+        key = 'cpu_percent' if sort_by == 'cpu' else 'memory_percent'
+        processes.sort(key=operator.itemgetter(key), reverse=True)
         
         # Format output
-        result = f"Top {top} Processes (by {sort_by}):\n"
-        result += f"{'PID':<8} {'USER':<15} {'CPU%':<8} {'MEM%':<8} {'NAME':<30}\n"
-        result += "-" * 70 + "\n"
-        
+        rows = [f"Top {top} Processes (by {sort_by}):", _PROC_HEADER, "-" * 70]
         for p in processes[:top]:
-            result += f"{p['pid']:<8} {p['username'][:15]:<15} {p.get('cpu_percent', 0):<8.1f} {p.get('memory_percent', 0):<8.1f} {p['name'][:30]:<30}\n"
-        
-        return result
+            rows.append(_PROC_ROW(p['pid'], (p['username'] or '?')[:15], p['cpu_percent'],
+                                  p['memory_percent'], p['name'][:30]))
+        rows.append('')
+        return '\n'.join(rows)
     
     def kill_process(self, pid: int, signal: int = 15) -> str:
         """Kill a process"""
+        psutil = _get_psutil()
         try:
             proc = psutil.Process(pid)
             proc.send_signal(signal)
@@ -165,28 +340,93 @@ class KaliLinuxControl:
     
     def find_process(self, name: str) -> str:
         """Find processes by name"""
-        result = self._run_command(f"pgrep -la {name}")
-        if result['success'] and result['output']:
-            return f"Processes matching '{name}':\n{result['output']}"
+        if not self.is_linux:
+            result = self._run_command(['pgrep', '-la', name])
+            if result['success'] and result['output']:
+                return f"Processes matching '{name}':\n{result['output']}"
+            return f"No processes found matching '{name}'"
+        
+        # Same output as `pgrep -la`, without the fork: match comm, show the command line
+        matches = []
+        for pid, comm, _, _ in self._scan_proc():
+            if name not in comm:
+                continue
+            try:
+                with open(f'/proc/{pid}/cmdline', 'rb') as f:
+                    cmdline = f.read().rstrip(b'\0').translate(_CMDLINE_SEPS).decode('utf-8', 'replace')
+            except OSError:
+                continue
+            matches.append(f"{pid} {cmdline or comm}")
+        
+        if matches:
+            return f"Processes matching '{name}':\n" + '\n'.join(matches)
         return f"No processes found matching '{name}'"
     
     # ============ Network Management ============
     
     def get_network_info(self) -> str:
         """Get network configuration"""
-        result = self._run_command("ip addr show")
-        if not result['success']:
-            result = self._run_command("ifconfig")
+        if self._net_tool == 'ip':
+            result = self._run_command(['ip', 'addr', 'show'])
+        else:
+            result = self._run_command(['ifconfig'])
         
         if result['success']:
             return f"Network Interfaces:\n{result['output']}"
         return f"Could not get network info: {result['error']}"
     
+    @staticmethod
+    def _socket_owners() -> Dict[int, str]:
+        """Socket inode -> ss-style users:(("name",pid=N,fd=N)) from /proc/*/fd"""
+        owners: Dict[int, List[str]] = {}
+        for pid, comm, _, _ in KaliLinuxControl._scan_proc():
+            try:
+                fds = os.scandir(f'/proc/{pid}/fd')
+            except OSError:
+                continue  # not ours to look at, or gone
+            with fds:
+                for fd in fds:
+                    try:
+                        target = os.readlink(fd.path)
+                    except OSError:
+                        continue
+                    if target.startswith('socket:['):
+                        owners.setdefault(int(target[8:-1]), []).append(f'("{comm}",pid={pid},fd={fd.name})')
+        return {inode: f"users:({','.join(users)})" for inode, users in owners.items()}
+    
+    def _proc_net_connections(self) -> List[str]:
+        """
+        TCP/UDP sockets from /proc/net/{tcp,tcp6,udp,udp6}, laid out like `ss -tunap`
+        
+        This is what ss reads itself, without the fork.
+        """
+        rows = []
+        for netid, family, path in _PROC_NET_TABLES:
+            try:
+                with open(path) as f:
+                    next(f)  # header
+                    lines = f.readlines()
+            except OSError:
+                continue
+            for line in lines:
+                fields = line.split()
+                state = _TCP_STATES.get(fields[3], fields[3]) if netid == 'tcp' else _UDP_STATES.get(fields[3], fields[3])
+                rows.append((netid, state, _proc_net_addr(family, fields[1]),
+                             _proc_net_addr(family, fields[2]), int(fields[9])))
+        
+        owners = self._socket_owners() if rows else {}
+        out = [f"{'Netid':<6}{'State':<12}{'Local Address:Port':<45}{'Peer Address:Port':<45}Process"]
+        for netid, state, local, peer, inode in rows:
+            out.append(f"{netid:<6}{state:<12}{local:<45}{peer:<45}{owners.get(inode, '')}".rstrip())
+        return out
+    
     def get_connections(self) -> str:
         """Get active network connections"""
-        result = self._run_command("ss -tunap", timeout=10)
-        if not result['success']:
-            result = self._run_command("netstat -tunap", timeout=10)
+        if self.is_linux:
+            lines = self._proc_net_connections()[:30]
+            return "Active Network Connections:\n" + '\n'.join(lines)
+        
+        result = self._run_command([self._sock_tool, '-tunap'], timeout=10)
         
         if result['success']:
             # Show first 30 lines
@@ -196,7 +436,7 @@ class KaliLinuxControl:
     
     def check_listening_ports(self) -> str:
         """Check listening ports"""
-        result = self._run_command("ss -tulnp")
+        result = self._run_command(['ss', '-tulnp'])
         if result['success']:
             lines = result['output'].split('\n')
             return "Listening Ports:\n" + '\n'.join(lines[:20])
@@ -206,7 +446,7 @@ class KaliLinuxControl:
     
     def list_services(self) -> str:
         """List system services"""
-        result = self._run_command("systemctl list-units --type=service --state=running")
+        result = self._run_command(['systemctl', 'list-units', '--type=service', '--state=running'])
         if result['success']:
             return f"Active Services:\n{result['output']}"
         return f"Could not list services: {result['error']}"
@@ -216,7 +456,7 @@ class KaliLinuxControl:
         if action not in ['start', 'stop', 'restart', 'status', 'enable', 'disable']:
             return f"Invalid action: {action}"
         
-        result = self._run_command(f"sudo systemctl {action} {service}")
+        result = self._run_command(['sudo', 'systemctl', action, service])
         if result['success']:
             return f"Service {service} {action}ed successfully"
         return f"Failed to {action} {service}: {result['error']}"
@@ -225,7 +465,7 @@ class KaliLinuxControl:
     
     def check_package(self, package: str) -> str:
         """Check if a package is installed"""
-        result = self._run_command(f"dpkg -l {package}")
+        result = self._run_command(['dpkg', '-l', package])
         if result['success'] and result['output']:
             lines = result['output'].split('\n')
             if len(lines) > 2 and 'ii' in lines[2]:
@@ -234,25 +474,29 @@ class KaliLinuxControl:
     
     def list_installed_packages(self, search: str = "") -> str:
         """List installed packages"""
-        if search:
-            result = self._run_command(f"dpkg -l | grep -i {search}")
-        else:
-            result = self._run_command("dpkg -l | head -50")
+        result = self._run_command(['dpkg', '-l'])
         
         if result['success']:
-            return f"Installed Packages:\n{result['output']}"
+            # Filtered here rather than through `| grep -i` / `| head`
+            lines = result['output'].splitlines()
+            if search:
+                needle = search.lower()
+                lines = [line for line in lines if needle in line.lower()]
+            else:
+                lines = lines[:50]
+            return "Installed Packages:\n" + '\n'.join(lines)
         return f"Could not list packages: {result['error']}"
     
     def apt_update(self) -> str:
         """Run apt update"""
-        result = self._run_command("sudo apt update", timeout=120)
+        result = self._run_command(['sudo', 'apt', 'update'], timeout=120)
         if result['success']:
             return "APT package lists updated successfully"
         return f"Failed to update: {result['error']}"
     
     def apt_upgrade(self) -> str:
         """Run apt upgrade"""
-        result = self._run_command("sudo apt upgrade -y", timeout=300)
+        result = self._run_command(['sudo', 'apt', 'upgrade', '-y'], timeout=300)
         if result['success']:
             return "System upgraded successfully"
         return f"Failed to upgrade: {result['error']}"
@@ -261,30 +505,40 @@ class KaliLinuxControl:
     
     def list_users(self) -> str:
         """List system users"""
-        result = self._run_command("cat /etc/passwd | grep -v nologin | grep -v false | cut -d: -f1,3,5")
-        if result['success']:
-            return f"System Users:\n{result['output']}"
-        return f"Could not list users: {result['error']}"
+        # name:uid:gecos of accounts with a login shell
+        try:
+            with open('/etc/passwd') as f:
+                users = [
+                    ':'.join(fields[i] for i in (0, 2, 4))
+                    for fields in (line.rstrip('\n').split(':') for line in f
+                                   if 'nologin' not in line and 'false' not in line)
+                    if len(fields) >= 5
+                ]
+        except OSError as e:
+            return f"Could not list users: {e}"
+        return "System Users:\n" + '\n'.join(users)
     
     def list_groups(self) -> str:
         """List system groups"""
-        result = self._run_command("getent group | cut -d: -f1")
-        if result['success']:
-            return f"System Groups:\n{result['output']}"
-        return f"Could not list groups: {result['error']}"
+        # grp goes through NSS like `getent group` does
+        try:
+            groups = [g.gr_name for g in grp.getgrall()]
+        except OSError as e:
+            return f"Could not list groups: {e}"
+        return "System Groups:\n" + '\n'.join(groups)
     
     # ============ Firewall ============
     
     def iptables_status(self) -> str:
         """Check iptables status"""
-        result = self._run_command("sudo iptables -L -n -v")
+        result = self._run_command(['sudo', 'iptables', '-L', '-n', '-v'])
         if result['success']:
             return f"IPTables Rules:\n{result['output']}"
         return f"Could not get iptables: {result['error']}"
     
     def ufw_status(self) -> str:
         """Check UFW status"""
-        result = self._run_command("sudo ufw status verbose")
+        result = self._run_command(['sudo', 'ufw', 'status', 'verbose'])
         if result['success']:
             return f"UFW Status:\n{result['output']}"
         return f"UFW not installed or not configured"
@@ -293,10 +547,13 @@ class KaliLinuxControl:
     
     def system_logs(self, lines: int = 50, service: str = "") -> str:
         """Get system logs"""
+        # journalctl stops after the last N entries itself; N is clamped so a
+        # spoken "a million lines" can't buffer the whole journal
+        lines = _clamp_log_lines(lines)
+        cmd = ['journalctl', '--no-pager', '--output=short-iso', '-n', str(lines)]
         if service:
-            result = self._run_command(f"journalctl -u {service} -n {lines}")
-        else:
-            result = self._run_command(f"journalctl -n {lines}")
+            cmd += ['-u', service]
+        result = self._run_command(cmd, timeout=10)
         
         if result['success']:
             return f"System Logs (last {lines} lines):\n{result['output']}"
@@ -304,16 +561,27 @@ class KaliLinuxControl:
     
     def dmesg_logs(self, lines: int = 30) -> str:
         """Get kernel messages"""
-        result = self._run_command(f"dmesg | tail -{lines}")
+        lines = _clamp_log_lines(lines)
+        result = self._run_command(['dmesg', '--ctime'], timeout=10)
         if result['success']:
-            return f"Kernel Messages:\n{result['output']}"
+            # rsplit with a limit only splits off the last lines, not the whole buffer
+            tail = result['output'].rsplit('\n', lines)[-lines:]
+            return "Kernel Messages:\n" + '\n'.join(tail)
         return f"Could not get dmesg: {result['error']}"
     
     def auth_logs(self, lines: int = 30) -> str:
         """Get authentication logs"""
-        result = self._run_command(f"sudo tail -{lines} /var/log/auth.log")
+        # Read it ourselves when permitted; only the last lines are kept
+        try:
+            with open('/var/log/auth.log', 'rb') as f:
+                tail = collections.deque(f, maxlen=max(lines, 0))
+            return "Auth Logs:\n" + b''.join(tail).decode('utf-8', 'replace').rstrip('\n')
+        except OSError:
+            pass
+        
+        result = self._run_command(['sudo', 'tail', '-n', str(int(lines)), '/var/log/auth.log'])
         if not result['success']:
-            result = self._run_command(f"journalctl -u ssh -n {lines}")
+            result = self._run_command(['journalctl', '--no-pager', '-u', 'ssh', '-n', str(int(lines))])
         if result['success']:
             return f"Auth Logs:\n{result['output']}"
         return f"Could not get auth logs: {result['error']}"
@@ -322,16 +590,22 @@ class KaliLinuxControl:
     
     def disk_usage(self) -> str:
         """Get disk usage"""
-        result = self._run_command("df -h")
+        result = self._run_command(['df', '-h'])
         if result['success']:
             return f"Disk Usage:\n{result['output']}"
         return f"Could not get disk usage: {result['error']}"
     
     def mount_points(self) -> str:
         """Get mount points"""
-        result = self._run_command("mount | column -t")
+        result = self._run_command(['mount'])
         if result['success']:
-            return f"Mount Points:\n{result['output']}"
+            # Aligned like `column -t`: each field padded to its column's width
+            rows = [line.split() for line in result['output'].splitlines()]
+            widths = [max(len(row[i]) for row in rows if len(row) > i)
+                      for i in range(max(map(len, rows), default=0))]
+            table = '\n'.join('  '.join(field.ljust(width) for field, width in zip(row, widths)).rstrip()
+                              for row in rows)
+            return f"Mount Points:\n{table}"
         return f"Could not get mounts: {result['error']}"
     
     # ============ Kali Linux Specific ============
@@ -342,7 +616,7 @@ class KaliLinuxControl:
             'Information Gathering': ['nmap', 'netdiscover', 'arp-scan', 'dnsenum', 'fierce'],
             'Vulnerability Analysis': ['nikto', 'openvas', 'sqlmap', 'commix'],
             'Exploitation Tools': ['msfconsole', 'searchsploit', 'empire', 'metasploit'],
-            'Wireless Attacks': ['aircrack-ng', 'wifite', 'reaver', ' bully'],
+            'Wireless Attacks': ['aircrack-ng', 'wifite', 'reaver', 'bully'],
             'Forensics': ['foremost', 'binwalk', 'volatility', 'autopsy'],
             'Password Attacks': ['hydra', 'john', 'hashcat', 'cupp'],
             'Reverse Engineering': ['radare2', 'ghidra', 'ida', 'objdump'],
@@ -351,15 +625,19 @@ class KaliLinuxControl:
             'Post Exploitation': ['mimikatz', 'privilege-escalation', 'persistence']
         }
         
-        result = "Kali Linux Tools Status:\n\n"
+        # Resolved against PATH in-process: no `which` fork per tool. The whole
+        # probe is a few hundred stat() calls (~3ms); a thread pool measured slower
+        installed = {tool: shutil.which(tool) is not None
+                     for tool_list in tools.values() for tool in tool_list}
+        
+        lines = ["Kali Linux Tools Status:\n"]
         for category, tool_list in tools.items():
-            result += f"\n{category}:\n"
+            lines.append(f"\n{category}:")
             for tool in tool_list:
-                check = self._run_command(f"which {tool}")
-                status = "✓ Installed" if check['success'] else "✗ Not found"
-                result += f"  {tool}: {status}\n"
-        
-        return result
+                status = "✓ Installed" if installed[tool] else "✗ Not found"
+                lines.append(f"  {tool}: {status}")
+        lines.append('')
+        return '\n'.join(lines)
     
     def check_root(self) -> str:
         """Check if running as root"""
@@ -371,15 +649,15 @@ class KaliLinuxControl:
     def run_nmap_scan(self, target: str, scan_type: str = 'basic') -> str:
         """Run nmap scan"""
         if scan_type == 'basic':
-            cmd = f"nmap -sV {target}"
+            cmd = ['nmap', '-sV', target]
         elif scan_type == 'quick':
-            cmd = f"nmap -F {target}"
+            cmd = ['nmap', '-F', target]
         elif scan_type == 'stealth':
-            cmd = f"nmap -sS -T stealth {target}"
+            cmd = ['nmap', '-sS', '-T', 'stealth', target]
         elif scan_type == 'full':
-            cmd = f"nmap -A -p- {target}"
+            cmd = ['nmap', '-A', '-p-', target]
         else:
-            cmd = f"nmap {target}"
+            cmd = ['nmap', target]
         
         result = self._run_command(cmd, timeout=120)
         if result['success']:
@@ -390,6 +668,7 @@ class KaliLinuxControl:
     
     def memory_info(self) -> str:
         """Get detailed memory info"""
+        psutil = _get_psutil()
         mem = psutil.virtual_memory()
         swap = psutil.swap_memory()
         
@@ -404,12 +683,50 @@ class KaliLinuxControl:
             f"  Free: {swap.free / (1024**3):.2f} GB"
         )
     
+    @staticmethod
+    def _read_proc_stat(path: str = '/proc/stat') -> List[Tuple[int, int]]:
+        """(idle, total) jiffies for the aggregate `cpu` line, then each core"""
+        counters = []
+        with open(path, 'rb') as f:
+            for line in f:
+                if not line.startswith(b'cpu'):
+                    break  # the cpu lines come first
+                # user nice system idle iowait irq softirq steal (guest is inside user)
+                ticks = [int(v) for v in line.split()[1:9]]
+                counters.append((ticks[3] + ticks[4], sum(ticks)))
+        return counters
+    
+    def _cpu_usage_since_last(self) -> List[float]:
+        """Busy % per /proc/stat cpu line over the interval since the last snapshot"""
+        current = self._read_proc_stat()
+        previous = self._prev_stat
+        if previous is None or len(previous) != len(current):
+            # No baseline yet: take a short one
+            previous = current
+            time.sleep(0.1)
+            current = self._read_proc_stat()
+        self._prev_stat = current
+        
+        usage = []
+        for (idle, total), (prev_idle, prev_total) in zip(current, previous):
+            elapsed = total - prev_total
+            usage.append(100.0 * (1 - (idle - prev_idle) / elapsed) if elapsed > 0 else 0.0)
+        return usage
+    
     def cpu_info(self) -> str:
         """Get CPU information"""
-        cpu = psutil.cpu_percent(interval=1, percpu=True)
+        psutil = _get_psutil()
+        if self.is_linux:
+            # Usage since the previous call (or since startup); no sleep
+            usage = self._cpu_usage_since_last()
+            total, cpu = usage[0], usage[1:]
+        else:
+            # One 1s sample; the overall figure is the mean of the same per-core readings
+            cpu = psutil.cpu_percent(interval=1, percpu=True)
+            total = sum(cpu) / len(cpu) if cpu else 0.0
         cpu_freq = psutil.cpu_freq()
         
-        result = f"CPU Usage: {psutil.cpu_percent(interval=1)}%\n"
+        result = f"CPU Usage: {total:.1f}%\n"
         result += f"Per-core usage: {', '.join([f'{c:.1f}%' for c in cpu])}\n"
         
         if cpu_freq:
@@ -425,6 +742,7 @@ class KaliLinuxControl:
     
     def io_stats(self) -> str:
         """Get I/O statistics"""
+        psutil = _get_psutil()
         io = psutil.disk_io_counters()
         
         if io:
@@ -439,12 +757,39 @@ class KaliLinuxControl:
     
     # ============ File Operations ============
     
-    def find_large_files(self, path: str = '/', size_mb: int = 100) -> str:
+    def find_large_files(self, path: str = '/', size_mb: int = 100, limit: int = 20) -> str:
         """Find large files"""
-        result = self._run_command(f"sudo find {path} -type f -size +{size_mb}M -exec ls -lh {{}} \\; 2>/dev/null | head -20")
-        if result['success']:
-            return f"Large files (>={size_mb}MB):\n{result['output']}"
-        return f"Could not find files: {result['error']}"
+        threshold = size_mb << 20
+        largest: List[Tuple[int, str]] = []  # min-heap of the `limit` biggest so far
+        
+        # In-process scandir walk: one stat per file instead of an `ls` fork per hit.
+        # Kernel pseudo-filesystems are skipped (/proc/kcore alone would "match").
+        stack = [path]
+        while stack:
+            try:
+                it = os.scandir(stack.pop())
+            except OSError:
+                continue  # unreadable, like find's 2>/dev/null
+            with it:
+                for entry in it:
+                    try:
+                        if entry.is_dir(follow_symlinks=False):
+                            if entry.path not in _PSEUDO_FS_DIRS:
+                                stack.append(entry.path)
+                        elif entry.is_file(follow_symlinks=False):
+                            size = entry.stat(follow_symlinks=False).st_size
+                            if size > threshold:
+                                if len(largest) < limit:
+                                    heapq.heappush(largest, (size, entry.path))
+                                else:
+                                    heapq.heappushpop(largest, (size, entry.path))
+                    except OSError:
+                        pass
+        
+        if not largest:
+            return f"No files larger than {size_mb}MB under {path}"
+        rows = [f"{_human_size(size):>8}  {file_path}" for size, file_path in sorted(largest, reverse=True)]
+        return f"Large files (>={size_mb}MB):\n" + '\n'.join(rows)
     
     def file_permissions(self, path: str) -> str:
         """Get file permissions"""
@@ -4,18 +4,42 @@ Play music from YouTube using voice commands
 """
 
 import os
+import json
+import shutil
+import socket
+import tempfile
+import functools
+import importlib.util
 import subprocess
 import threading
 import re
 from typing import Optional, Dict, Any
 import urllib.parse
 
-# Try to import yt-dlp
-try:
-    import yt_dlp
-    YTDL_AVAILABLE = True
-except ImportError:
-    YTDL_AVAILABLE = False
+# yt-dlp imports hundreds of extractors (a few hundred ms), so it is only
+# located here and imported on the first search
+YTDL_AVAILABLE = importlib.util.find_spec('yt_dlp') is not None
+_ytdlp = None
+
+
+def _get_ytdlp():
+    """Import yt-dlp on first use"""
+    global _ytdlp
+    if _ytdlp is None:
+        import yt_dlp
+        _ytdlp = yt_dlp
+    return _ytdlp
+
+
+# Voice command prefixes, longer ones first so "play song x" doesn't leave "song x"
+_PREFIX_RE = re.compile(r'^(?:bosco\s+play|play\s+(?:song|music)|play)\s+')
+_BY_RE = re.compile(r'\s+by\s+')
+
+
+@functools.lru_cache(maxsize=1)
+def _find_mpv() -> Optional[str]:
+    """Path to mpv, looked up once per process"""
+    return shutil.which('mpv')
 
 
 class MusicPlayer:
@@ -31,75 +55,75 @@ class MusicPlayer:
         self.is_playing: bool = False
         self.is_paused: bool = False
         
-        # Check if mpv is available
-        self.mpv_available = self._check_mpv()
+        # mpv's JSON IPC socket: pause/resume are a line written here
+        self._ipc_path = os.path.join(tempfile.gettempdir(), f"mpv-bosco-{os.getpid()}.sock")
+        self._ipc: Optional[socket.socket] = None
         
-    def _check_mpv(self) -> bool:
-        """Check if mpv is installed"""
-        try:
-            result = subprocess.run(
-                ['which', 'mpv'],
-                capture_output=True,
-                text=True
-            )
-            return result.returncode == 0
-        except:
-            return False
-    
-    def _check_ytdlp(self) -> bool:
-        """Check if yt-dlp is installed"""
-        return YTDL_AVAILABLE
+        # One YoutubeDL reused for every lookup (its HTTP session stays warm);
+        # created on the first search so yt-dlp is still imported lazily
+        self._ydl = None
+        self._ydl_lock = threading.Lock()
+        
+        # Check if mpv is available
+        self.mpv_path = _find_mpv()
+        self.mpv_available = self.mpv_path is not None
     
     def parse_song_command(self, command: str) -> Dict[str, str]:
         """
         Parse voice command like "play fear by NF"
         Returns: {'song': 'fear', 'artist': 'NF'}
         """
-        command = command.lower().strip()
-        
-        # Remove common prefixes
-        for prefix in ['play ', 'play song ', 'play music ', 'play ', 'bosco play ']:
-            if command.startswith(prefix):
-                command = command[len(prefix):]
-                break
+        # Remove common prefixes (longest alternative wins)
+        command = _PREFIX_RE.sub('', command.lower().strip(), count=1)
         
         # Try to parse "song by artist" format
-        if ' by ' in command:
-            parts = command.split(' by ')
-            song = parts[0].strip()
-            artist = parts[1].strip() if len(parts) > 1 else ''
-            return {'song': song, 'artist': artist}
+        parts = _BY_RE.split(command, maxsplit=1)
+        if len(parts) == 2:
+            return {'song': parts[0].strip(), 'artist': parts[1].strip()}
         
         # If no "by", treat entire command as search query
         return {'song': command, 'artist': ''}
     
+    def _extract_stream(self, target: str) -> Optional[str]:
+        """
+        Direct audio stream URL for a video URL or a "ytsearch1:" query
+        
+        With a format selected yt-dlp resolves the stream while extracting,
+        so one extract_info call goes from query to playable URL.
+        """
+        # YoutubeDL isn't safe to share between threads, so lookups take turns
+        with self._ydl_lock:
+            if self._ydl is None:
+                self._ydl = _get_ytdlp().YoutubeDL({
+                    'format': 'bestaudio/best',
+                    'noplaylist': True,
+                    'quiet': True,
+                    'no_warnings': True,
+                    'socket_timeout': 5,
+                })
+            info = self._ydl.extract_info(target, download=False)
+        
+        if info and 'entries' in info:
+            entries = info['entries']
+            info = entries[0] if entries else None
+        if not info:
+            return None
+        if info.get('url'):
+            return info['url']
+        # A merged video+audio selection lists its parts instead
+        formats = info.get('requested_formats') or []
+        return formats[-1].get('url') if formats else None
+    
     def search_youtube(self, query: str) -> Optional[str]:
         """
         Search YouTube and get the best audio stream URL
         """
-        if not self._check_ytdlp():
+        if not YTDL_AVAILABLE:
             return None
         
-        ydl_opts = {
-            'format': 'bestaudio/best',
-            'noplaylist': True,
-            'quiet': True,
-            'no_warnings': True,
-            'extract_flat': False,
-        }
-        
         try:
-            with yt_dlp.YoutubeDL(ydl_opts) as ydl:
-                # Search for the video
-                search_query = f"ytsearch5:{query}"
-                info = ydl.extract_info(search_query, download=False)
-                
-                if info and info.get('entries'):
-                    # Get the first (most relevant) result
-                    video_info = info['entries'][0]
-                    video_url = video_info.get('webpage_url')
-                    
-                    return video_url
+            # Only the top result is played, so don't resolve five
+            return self._extract_stream(f"ytsearch1:{query}")
         except Exception as e:
             print(f"[Music] Search error: {e}")
         
@@ -107,21 +131,11 @@ class MusicPlayer:
     
     def get_audio_url(self, video_url: str) -> Optional[str]:
         """Get direct audio stream URL from video URL"""
-        if not self._check_ytdlp():
+        if not YTDL_AVAILABLE:
             return None
         
-        ydl_opts = {
-            'format': 'bestaudio/best',
-            'quiet': True,
-            'no_warnings': True,
-            'geturl': True,
-        }
-        
         try:
-            with yt_dlp.YoutubeDL(ydl_opts) as ydl:
-                info = ydl.extract_info(video_url, download=False)
-                if info and 'url' in info:
-                    return info['url']
+            return self._extract_stream(video_url)
         except Exception as e:
             print(f"[Music] Audio URL error: {e}")
         
@@ -140,17 +154,11 @@ class MusicPlayer:
         else:
             search_query = f"{song} audio"
         
-        # Search for the song
-        video_url = self.search_youtube(search_query)
-        
-        if not video_url:
-            return f"❌ Could not find '{song}' by '{artist}' on YouTube"
-        
-        # Get audio URL
-        audio_url = self.get_audio_url(video_url)
+        # Search for the song; the top hit comes back as a playable stream URL
+        audio_url = self.search_youtube(search_query)
         
         if not audio_url:
-            return f"❌ Could not get audio stream for '{song}'"
+            return f"❌ Could not find '{song}' by '{artist}' on YouTube"
         
         # Start playing with mpv
         return self._play_stream(audio_url, song, artist)
@@ -162,12 +170,14 @@ class MusicPlayer:
             return "❌ mpv is not installed. Install with: sudo apt install mpv"
         
         try:
-            # Kill any existing mpv processes
-            subprocess.run(['pkill', '-f', 'mpv'], capture_output=True)
+            # Stop our previous mpv (a single kill(), no /proc walk)
+            if self.current_process:
+                self.stop()
             
             # Start mpv in background mode
             self.current_process = subprocess.Popen(
-                ['mpv', '--no-video', '--quiet', '--idle=yes', url],
+                [self.mpv_path, '--no-video', '--quiet', '--idle=yes',
+                 f'--input-ipc-server={self._ipc_path}', url],
                 stdout=subprocess.DEVNULL,
                 stderr=subprocess.DEVNULL
             )
@@ -185,6 +195,45 @@ class MusicPlayer:
         except Exception as e:
             return f"❌ Error playing music: {str(e)}"
     
+    def _mpv_command(self, *command) -> bool:
+        """
+        Send one command over mpv's JSON IPC socket; False if mpv can't be reached
+        
+        The connection is kept between calls and reopened once if it broke
+        (e.g. mpv restarted for the next song).
+        """
+        line = json.dumps({'command': list(command)}).encode() + b'\n'
+        for _ in range(2):
+            try:
+                if self._ipc is None:
+                    ipc = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+                    ipc.settimeout(1)
+                    try:
+                        ipc.connect(self._ipc_path)
+                    except OSError:
+                        ipc.close()
+                        raise
+                    self._ipc = ipc
+                # Drop replies/events mpv queued since the last command
+                self._ipc.setblocking(False)
+                try:
+                    while self._ipc.recv(65536):
+                        pass
+                except BlockingIOError:
+                    pass
+                self._ipc.settimeout(1)
+                self._ipc.sendall(line)
+                return True
+            except OSError:
+                self._close_ipc()
+        return False
+    
+    def _close_ipc(self):
+        """Forget the IPC connection"""
+        if self._ipc is not None:
+            self._ipc.close()
+            self._ipc = None
+    
     def pause(self) -> str:
         """Pause current playback"""
         if not self.is_playing:
@@ -193,8 +242,12 @@ class MusicPlayer:
         if self.is_paused:
             return "Music is already paused"
         
+        if self._mpv_command('set_property', 'pause', True):
+            self.is_paused = True
+            return "⏸️ Paused"
+        
         try:
-            # Send pause command to mpv via IPC
+            # mpv without the socket (e.g. started by an older run): go through MPRIS
             subprocess.run(
                 ['playerctl', '-p', 'mpv', 'pause'],
                 capture_output=True
@@ -213,6 +266,10 @@ class MusicPlayer:
         if not self.is_paused:
             return "Music is not paused"
         
+        if self._mpv_command('set_property', 'pause', False):
+            self.is_paused = False
+            return "▶️ Resumed"
+        
         try:
             subprocess.run(
                 ['playerctl', '-p', 'mpv', 'play'],
@@ -233,9 +290,10 @@ class MusicPlayer:
             except:
                 self.current_process.kill()
             self.current_process = None
-        
-        # Also kill any mpv processes
-        subprocess.run(['pkill', '-f', 'mpv'], capture_output=True)
+            self._close_ipc()
+        else:
+            # No handle (e.g. after a restart): stop any mpv left behind
+            self._kill_stray_mpv()
         
         self.is_playing = False
         self.is_paused = False
@@ -244,6 +302,21 @@ class MusicPlayer:
         
         return "⏹️ Stopped playing"
     
+    @staticmethod
+    def _kill_stray_mpv():
+        """Terminate processes named exactly mpv (pkill -f would hit any command line containing it)"""
+        try:
+            import psutil
+        except ImportError:
+            subprocess.run(['pkill', '-x', 'mpv'], capture_output=True)
+            return
+        for proc in psutil.process_iter(['name']):
+            if proc.info['name'] == 'mpv':
+                try:
+                    proc.terminate()
+                except psutil.Error:
+                    pass
+    
     def next(self) -> str:
         """Skip to next song (not implemented for YouTube streams)"""
         return "⏭️ Next song not available for YouTube streams. Say 'stop' to stop and play something else."
@@ -309,7 +382,7 @@ if __name__ == "__main__":
     player = get_music_player()
     
     print(f"mpv available: {player.mpv_available}")
-    print(f"yt-dlp available: {player._check_ytdlp()}")
+    print(f"yt-dlp available: {YTDL_AVAILABLE}")
     
     # Test parsing
     test_commands = [
@@ -2,7 +2,14 @@
 import subprocess
 import os
 import time
-from pathlib import Path
+import fnmatch
+import functools
+import shutil
+import signal
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+from bosco_os.capabilities.system.spawn import spawn_detached
 
 # Try importing GUI libraries, with fallbacks
 try:
@@ -15,6 +22,23 @@ except Exception as e:
     pyautogui = None
     PYAUTOGUI_AVAILABLE = False
 
+# Bound once so the per-action calls skip the module attribute lookups;
+# the screen size is asked of the X server once, see refresh_screen_size()
+if PYAUTOGUI_AVAILABLE:
+    _moveTo = pyautogui.moveTo
+    _click = pyautogui.click
+    _doubleClick = pyautogui.doubleClick
+    _rightClick = pyautogui.rightClick
+    _scroll = pyautogui.scroll
+    _write = pyautogui.write
+    _press = pyautogui.press
+    _hotkey = pyautogui.hotkey
+    _size = pyautogui.size
+    _screenshot = pyautogui.screenshot
+    _SCREEN_SIZE = _size()
+else:
+    _SCREEN_SIZE = (1920, 1080)  # Default
+
 try:
     import pyperclip
     PYPERCLIP_AVAILABLE = True
@@ -22,17 +46,190 @@ except:
     pyperclip = None
     PYPERCLIP_AVAILABLE = False
 
+# With type_text(paste=True), longer text is pasted rather than typed key by key
+_PASTE_THRESHOLD = 32
+
+# XShm screen grabs into a reused BGRA buffer; pyautogui is the fallback
+try:
+    import mss
+    import mss.tools
+    MSS_AVAILABLE = True
+except ImportError:
+    MSS_AVAILABLE = False
+
+# Pixel views of mss frames for analyze_screen
+try:
+    import numpy as np
+    NUMPY_AVAILABLE = True
+except ImportError:
+    NUMPY_AVAILABLE = False
+
+# JPEG/PPM encoding without PNG's compression pass
+try:
+    import cv2
+    CV2_AVAILABLE = True
+except ImportError:
+    CV2_AVAILABLE = False
+
+
+# Spoken app names (lowercase) -> executable
+_APP_MAP = {
+    "chrome": "google-chrome",
+    "firefox": "firefox",
+    "vscode": "code",
+    "terminal": "gnome-terminal",
+    "file manager": "nautilus",
+    "spotify": "spotify",
+    "discord": "discord",
+}
+# Ready-made argv lists for open_app (Popen doesn't modify them)
+_APP_ARGV = {name: [cmd] for name, cmd in _APP_MAP.items()}
+
+# Apps, files and URLs are started from here so the caller never waits on fork/exec
+_launch_pool = ThreadPoolExecutor(max_workers=2, thread_name_prefix='pc-launch')
+
+
+def _report_launch_error(future):
+    if future.exception() is not None:
+        print(f"Note: launch failed: {future.exception()}")
+
+
+def _launch(argv):
+    """Start argv detached in the background, without waiting for it"""
+    future = _launch_pool.submit(spawn_detached, argv)
+    future.add_done_callback(_report_launch_error)
+
+
+def _terminate_matching(pattern):
+    """SIGTERM every process whose command line contains pattern (pkill -f, without forking pkill)"""
+    if not os.path.isdir('/proc'):
+        subprocess.run(["pkill", "-f", pattern], stdout=subprocess.DEVNULL)
+        return
+    needle = pattern.encode()
+    own_pid = os.getpid()
+    for entry in os.listdir('/proc'):
+        if not entry.isdigit() or int(entry) == own_pid:
+            continue
+        try:
+            with open(f'/proc/{entry}/cmdline', 'rb') as f:
+                cmdline = f.read().replace(b'\0', b' ')
+            if needle in cmdline:
+                os.kill(int(entry), signal.SIGTERM)
+        except OSError:
+            pass  # exited meanwhile, or not ours to signal
+
+
+_WILDCARDS = '*?['
+
+# locate reads a prebuilt index of every path; the scandir walk is the fallback
+_LOCATE = shutil.which('locate')
+# Candidates read from locate before keeping the ones under the searched root
+_LOCATE_SCAN = 1000
+# find_file results are reused for this many seconds
+_FIND_TTL = 30
+
+
+def _locate_match(root, name, limit=10, keep=None):
+    """
+    Like _scandir_match, from the locate database; None if there is no usable index
+    
+    The index can be stale, so hits that no longer exist are dropped.
+    """
+    if _LOCATE is None:
+        return None
+    try:
+        r = subprocess.run([_LOCATE, '-i', '-b', '-l', str(_LOCATE_SCAN), name],
+                           capture_output=True, text=True, timeout=1.0)
+    except (OSError, subprocess.TimeoutExpired):
+        return None
+    if r.returncode != 0 or not r.stdout:
+        return None
+    prefix = root.rstrip('/') + '/'
+    results = []
+    for hit in r.stdout.splitlines():
+        if hit.startswith(prefix) and (keep is None or keep(hit)) and os.path.lexists(hit):
+            results.append(hit)
+            if len(results) >= limit:
+                break
+    return results or None
+
+
+@functools.lru_cache(maxsize=128)
+def _find_cached(name, root, limit, ttl_bucket):
+    """
+    find_file's lookup; ttl_bucket (monotonic time // _FIND_TTL) expires entries
+    
+    Only the last component of `name` is searched for. Leading directories
+    ("projects/bot/main") may sit at any depth, as with rglob, so hits are kept
+    when the directories above them end with that prefix; an absolute prefix
+    is anchored and simply becomes the root.
+    """
+    head, _, name = name.rpartition('/')
+    keep = None
+    if head.startswith('/') and not any(c in head for c in _WILDCARDS):
+        root = head
+    elif head:
+        keep = functools.partial(_under_dirs, root, f"*{head.lower()}")
+    results = None
+    if not any(c in name for c in _WILDCARDS):
+        results = _locate_match(root, name, limit, keep)
+    if results is None:
+        results = _scandir_match(root, name, limit, keep)
+    return tuple(results)
+
+
+def _under_dirs(root, pattern, path):
+    """Whether the directories between root and path match `pattern` (lowercase fnmatch)"""
+    parent = os.path.relpath(os.path.dirname(path), root)
+    return parent != '.' and fnmatch.fnmatchcase(parent.lower(), pattern)
+
+
+def _scandir_match(root, name, limit=10, keep=None):
+    """
+    Paths under root whose name contains `name` (case-insensitive), first `limit` only
+    
+    keep, if given, is a further filter on each matching path.
+    """
+    needle = name.lower()
+    if any(c in needle for c in _WILDCARDS):
+        pattern = f"*{needle}*"
+        matches = lambda n: fnmatch.fnmatchcase(n, pattern)
+    else:
+        matches = lambda n: needle in n
+    
+    results = []
+    # Explicit stack, names only: is_dir() comes from d_type, so no stat per entry
+    stack = [root]
+    while stack:
+        try:
+            it = os.scandir(stack.pop())
+        except OSError:
+            continue
+        with it:
+            for entry in it:
+                if matches(entry.name.lower()) and (keep is None or keep(entry.path)):
+                    results.append(entry.path)
+                    if len(results) >= limit:
+                        return results
+                try:
+                    if entry.is_dir(follow_symlinks=False):
+                        stack.append(entry.path)
+                except OSError:
+                    pass
+    return results
+
 
 class PCControl:
     """Full PC control - mouse, keyboard, windows, apps, files"""
     
     def __init__(self):
-        pass
+        # mss grabbers are tied to the thread that opened them, so one per thread
+        self._sct_local = threading.local()
         
     # === MOUSE CONTROL ===
     def move_mouse(self, x, y):
         if PYAUTOGUI_AVAILABLE:
-            pyautogui.moveTo(x, y)
+            _moveTo(x, y)
         return f"Move to {x}, {y}"
     
     def click(self, x=None, y=None, button='left'):
@@ -40,88 +237,142 @@ class PCControl:
         if PYAUTOGUI_AVAILABLE:
             try:
                 if x is not None and y is not None:
-                    pyautogui.click(x, y, button=button)
+                    _click(x, y, button=button)
                 else:
-                    pyautogui.click(button=button)
+                    _click(button=button)
             except Exception as e:
                 return f"Click error: {e}"
         return f"Clicked {button}"
     
     def double_click(self, x=None, y=None):
         if PYAUTOGUI_AVAILABLE:
-            pyautogui.doubleClick(x, y)
+            _doubleClick(x, y)
         return "Double clicked"
     
     def right_click(self, x=None, y=None):
         if PYAUTOGUI_AVAILABLE:
-            pyautogui.rightClick(x, y)
+            _rightClick(x, y)
         return "Right clicked"
     
     def scroll(self, amount):
         if PYAUTOGUI_AVAILABLE:
-            pyautogui.scroll(amount)
+            _scroll(amount)
         return f"Scrolled {amount}"
     
     # === KEYBOARD CONTROL ===
-    def type_text(self, text):
+    def type_text(self, text, paste=False):
+        """
+        Type text key by key
+        
+        paste=True lets text over _PASTE_THRESHOLD characters go through
+        type_text_fast instead; only ask for it when the focused window is
+        known to paste on Ctrl+V (terminals usually don't).
+        """
+        if paste and len(text) > _PASTE_THRESHOLD and PYPERCLIP_AVAILABLE:
+            return self.type_text_fast(text)
         if PYAUTOGUI_AVAILABLE:
-            pyautogui.write(text)
+            _write(text)
+        return f"Typed: {text}"
+    
+    def type_text_fast(self, text):
+        """
+        Type text with one Ctrl+V instead of a key event (and PAUSE) per character
+        
+        Only for windows that paste on Ctrl+V: terminals such as gnome-terminal
+        want Ctrl+Shift+V and would receive nothing. The clipboard is put back
+        afterwards, but pyperclip only sees text, so an image or other non-text
+        clipboard is lost (and an empty one is left holding `text`).
+        """
+        if not PYAUTOGUI_AVAILABLE:
+            return f"Typed: {text}"
+        try:
+            previous = pyperclip.paste()
+            pyperclip.copy(text)
+        except Exception:
+            # No clipboard backend (xclip/xsel/wl-clipboard missing)
+            _write(text)
+            return f"Typed: {text}"
+        _hotkey('ctrl', 'v')
+        # Let the focused app read the selection before it is put back
+        time.sleep(0.02)
+        if previous:
+            try:
+                pyperclip.copy(previous)
+            except Exception:
+                pass
         return f"Typed: {text}"
     
     def press_key(self, key):
         if PYAUTOGUI_AVAILABLE:
-            pyautogui.press(key)
+            _press(key)
         return f"Pressed {key}"
     
     def hotkey(self, *keys):
         if PYAUTOGUI_AVAILABLE:
-            pyautogui.hotkey(*keys)
+            _hotkey(*keys)
         return f"Hotkey: {'+'.join(keys)}"
     
     # === WINDOW CONTROL ===
     def get_screen_size(self):
+        return _SCREEN_SIZE
+    
+    def refresh_screen_size(self):
+        """Re-read the screen size (after a display is plugged in or rearranged)"""
+        global _SCREEN_SIZE
         if PYAUTOGUI_AVAILABLE:
-            return pyautogui.size()
-        return (1920, 1080)  # Default
+            _SCREEN_SIZE = _size()
+        return _SCREEN_SIZE
+    
+    def _grab(self):
+        """Whole-screen mss frame, or None when mss can't capture"""
+        if not MSS_AVAILABLE:
+            return None
+        try:
+            sct = getattr(self._sct_local, 'sct', None)
+            if sct is None:
+                sct = self._sct_local.sct = mss.mss()
+            # monitors[0] is the whole root window, what pyautogui.screenshot() captures
+            return sct.grab(sct.monitors[0])
+        except Exception:
+            return None
+    
+    @staticmethod
+    def _frame_array(frame):
+        """BGRA pixels of an mss frame as a numpy view (no copy)"""
+        return np.frombuffer(frame.raw, dtype=np.uint8).reshape(frame.height, frame.width, 4)
     
     def screenshot(self, path=None):
         if not path:
             path = f"/home/tradler/Pictures/screenshot_{int(time.time())}.png"
-        if PYAUTOGUI_AVAILABLE:
-            pyautogui.screenshot(path)
+        frame = self._grab()
+        if frame is not None:
+            if CV2_AVAILABLE and path.lower().endswith(('.jpg', '.jpeg', '.ppm')):
+                # No DEFLATE pass: JPEG/PPM are several times quicker to write than PNG
+                bgr = cv2.cvtColor(self._frame_array(frame), cv2.COLOR_BGRA2BGR)
+                params = [] if path.lower().endswith('.ppm') else [cv2.IMWRITE_JPEG_QUALITY, 90]
+                cv2.imwrite(path, bgr, params)
+            else:
+                mss.tools.to_png(frame.rgb, frame.size, level=1, output=path)
+        elif PYAUTOGUI_AVAILABLE:
+            _screenshot(path)
         return f"Saved: {path}"
     
     # === APPLICATION CONTROL ===
     def open_app(self, app_name):
-        apps = {
-            "chrome": "google-chrome",
-            "firefox": "firefox",
-            "vscode": "code",
-            "terminal": "gnome-terminal",
-            "file manager": "nautilus",
-            "spotify": "spotify",
-            "discord": "discord",
-        }
-        cmd = apps.get(app_name.lower(), app_name)
-        subprocess.Popen([cmd], stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+        argv = _APP_ARGV.get(app_name.lower())
+        _launch(argv or [app_name])
         return f"Opened {app_name}"
     
     def close_app(self, app_name):
-        subprocess.run(["pkill", "-f", app_name], stdout=subprocess.DEVNULL)
+        _terminate_matching(app_name)
         return f"Closed {app_name}"
     
     # === FILE OPERATIONS ===
     def find_file(self, name, path="/home"):
-        result = []
-        try:
-            for p in Path(path).rglob(f"*{name}*"):
-                result.append(str(p))
-        except:
-            pass
-        return result[:10]
+        return list(_find_cached(name, path, 10, int(time.monotonic() // _FIND_TTL)))
     
     def open_file(self, filepath):
-        subprocess.Popen(["xdg-open", filepath], stdout=subprocess.DEVNULL)
+        _launch(["xdg-open", filepath])
         return f"Opened {filepath}"
     
     # === SYSTEM ===
@@ -136,15 +387,43 @@ class PCControl:
         return "Copied to clipboard"
     
     def open_url(self, url):
-        subprocess.Popen(["xdg-open", url], stdout=subprocess.DEVNULL)
+        _launch(["xdg-open", url])
         return f"Opened {url}"
     
     # === REAL-TIME ANALYSIS ===
     def analyze_screen(self):
+        """
+        Current screen as (width, height, pixels), pixels an HxWx4 BGRA array
+        
+        Nothing is encoded: the mss frame is handed over as a view of its
+        buffer. None when the screen can't be captured.
+        """
+        if not NUMPY_AVAILABLE:
+            return None
+        frame = self._grab()
+        if frame is not None:
+            return frame.width, frame.height, self._frame_array(frame)
         if PYAUTOGUI_AVAILABLE:
-            screenshot = pyautogui.screenshot()
-            return f"Screen captured, size: {screenshot.size}"
-        return "Screen analysis ready"
+            image = _screenshot().convert('RGBA')
+            return image.width, image.height, np.asarray(image)[..., [2, 1, 0, 3]]
+        return None
+    
+    def analyze_screen_ppm(self):
+        """Current screen as binary PPM bytes (an uncompressed header + RGB dump)"""
+        shot = self.analyze_screen()
+        if shot is None:
+            return None
+        width, height, pixels = shot
+        return b'P6\n%d %d\n255\n' % (width, height) + pixels[..., 2::-1].tobytes()
+    
+    def analyze_screen_jpeg(self, quality=85):
+        """Current screen as JPEG bytes, for streaming it somewhere else"""
+        shot = self.analyze_screen() if CV2_AVAILABLE else None
+        if shot is None:
+            return None
+        ok, buf = cv2.imencode('.jpg', cv2.cvtColor(shot[2], cv2.COLOR_BGRA2BGR),
+                               [cv2.IMWRITE_JPEG_QUALITY, quality])
+        return buf.tobytes() if ok else None
 
 
 # Global instance
@@ -152,7 +431,7 @@ _pc = PCControl()
 
 # Quick functions
 def click(x=None, y=None): return _pc.click(x, y)
-def type_text(text): return _pc.type_text(text)
+def type_text(text, paste=False): return _pc.type_text(text, paste)
 def press_key(key): return _pc.press_key(key)
 def hotkey(*keys): return _pc.hotkey(*keys)
 def screenshot(): return _pc.screenshot()
@@ -0,0 +1,55 @@
+"""
+Bosco Core - Detached Process Launcher
+Fire-and-forget launches shared by the system control modules
+"""
+
+import os
+import subprocess
+import threading
+from typing import List
+
+# Pids from spawn_detached, reaped opportunistically so they don't linger as zombies
+_SPAWNED: set = set()
+_SPAWNED_LOCK = threading.Lock()
+
+
+def reap_spawned():
+    """Collect any detached children that have exited"""
+    with _SPAWNED_LOCK:
+        for pid in list(_SPAWNED):
+            try:
+                done, _ = os.waitpid(pid, os.WNOHANG)
+            except ChildProcessError:
+                done = pid
+            if done:
+                _SPAWNED.discard(pid)
+
+
+def spawn_detached(argv: List[str]) -> int:
+    """
+    Start a fire-and-forget program in its own session, stdio on /dev/null
+
+    os.posix_spawnp is vfork+exec on glibc, so a parent with a large heap
+    doesn't pay for copying its page tables. Falls back to Popen elsewhere.
+    argv[0] is looked up on PATH. Returns the child's pid.
+    """
+    reap_spawned()
+    if hasattr(os, 'posix_spawnp'):
+        # Our own fds are close-on-exec, so only stdio reaches the child
+        pid = os.posix_spawnp(argv[0], argv, os.environ, setsid=True, file_actions=[
+            (os.POSIX_SPAWN_OPEN, 0, os.devnull, os.O_RDONLY, 0),
+            (os.POSIX_SPAWN_OPEN, 1, os.devnull, os.O_WRONLY, 0),
+            (os.POSIX_SPAWN_OPEN, 2, os.devnull, os.O_WRONLY, 0),
+        ])
+    else:
+        pid = subprocess.Popen(
+            argv,
+            stdin=subprocess.DEVNULL,
+            stdout=subprocess.DEVNULL,
+            stderr=subprocess.DEVNULL,
+            close_fds=True,
+            start_new_session=True
+        ).pid
+    with _SPAWNED_LOCK:
+        _SPAWNED.add(pid)
+    return pid
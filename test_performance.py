@@ -0,0 +1,485 @@
+#!/usr/bin/env python3
+"""
+Bosco Core - Performance Paths Test Script
+Checks that the optimized code paths behave like the simple ones they replaced
+"""
+
+import asyncio
+import os
+import shutil
+import sys
+import tempfile
+import threading
+
+# Add this directory to path
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+os.environ['SDL_AUDIODRIVER'] = 'dummy'
+os.environ['PYGAME_HIDE_SUPPORT_PROMPT'] = '1'
+
+
+def _write_log(lines):
+    """Write lines to a temporary log file and return its path"""
+    handle = tempfile.NamedTemporaryFile('w', suffix='.log', delete=False)
+    with handle:
+        handle.write(''.join(line + '\n' for line in lines))
+    return handle.name
+
+
+def test_threat_block_scan_anchored():
+    """Anchored patterns match at every line of a block scan"""
+    from bosco_os.capabilities.security.threat_detector import ThreatDetector, ThreatPattern
+
+    detector = ThreatDetector({"debounce_seconds": 0})
+    detector.add_pattern(ThreatPattern(
+        name="anchored",
+        pattern=r"^ok line \d+$",
+        severity="low",
+        description="Anchored test pattern"
+    ))
+
+    lines = [f"ok line {i}" for i in range(10)] + ["not ok line 99"]
+    path = _write_log(lines)
+    try:
+        events = detector.detect_in_log(path, lines=len(lines))
+    finally:
+        os.unlink(path)
+
+    anchored = [e for e in events if e.pattern_name == "anchored"]
+    assert len(anchored) == 10, f"expected 10 anchored events, got {len(anchored)}"
+
+    per_line = sum(
+        1 for line in lines
+        for e in detector.detect_in_text(line + '\n', source="per_line")
+        if e.pattern_name == "anchored"
+    )
+    assert per_line == 10, f"per-line scan found {per_line} anchored events"
+
+
+def test_threat_regex_cache_bounded():
+    """Compiled patterns are shared between ThreatPatterns and the cache is capped"""
+    from bosco_os.capabilities.security import threat_detector
+    from bosco_os.capabilities.security.threat_detector import ThreatPattern
+
+    first = ThreatPattern("a", r"shared\s+pattern", "low", "first")
+    second = ThreatPattern("b", r"shared\s+pattern", "low", "second")
+    assert first.compiled is second.compiled
+
+    for i in range(threat_detector._REGEX_CACHE_SIZE * 2):
+        threat_detector._compile_pattern(f"distinct_{i}\\d+")
+    info = threat_detector._compile_pattern.cache_info()
+    assert info.currsize <= threat_detector._REGEX_CACHE_SIZE, info
+
+
+def test_threat_debounce_counts():
+    """Repeats inside the debounce window fold into one event"""
+    from bosco_os.capabilities.security.threat_detector import ThreatDetector
+
+    detector = ThreatDetector({"debounce_seconds": 60})
+    events = []
+    for _ in range(5):
+        events.extend(detector.detect_in_text("malware found", source="debounce"))
+
+    malware = [e for e in events if e.pattern_name == "malware_signature"]
+    assert len(malware) == 1, f"expected 1 event, got {len(malware)}"
+    assert malware[0].details.get("suppressed_count") == 4, malware[0].details
+
+    # A different source is debounced separately
+    other = detector.detect_in_text("malware found", source="elsewhere")
+    assert any(e.pattern_name == "malware_signature" for e in other)
+
+
+def test_threat_debounce_threads():
+    """Concurrent scanners raise a debounced event only once"""
+    from bosco_os.capabilities.security.threat_detector import ThreatDetector
+
+    detector = ThreatDetector({"debounce_seconds": 60})
+    pattern = next(p for p in detector.patterns if p.name == "malware_signature")
+    barrier = threading.Barrier(8)
+    fired = []
+
+    def scan():
+        barrier.wait()
+        for _ in range(50):
+            event = detector._raise_event(pattern, "threads", "malware")
+            if event:
+                fired.append(event)
+
+    threads = [threading.Thread(target=scan) for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert len(fired) == 1, f"expected 1 event, got {len(fired)}"
+    assert fired[0].details["suppressed_count"] == 8 * 50 - 1
+
+
+def test_threat_debounce_pruned():
+    """Expired debounce entries are dropped instead of piling up"""
+    from bosco_os.capabilities.security.threat_detector import ThreatDetector
+
+    detector = ThreatDetector({"debounce_seconds": 0})
+    pattern = detector.patterns[0]
+    for i in range(detector._LAST_FIRE_PRUNE_AT * 4):
+        detector._raise_event(pattern, f"source_{i}", "text")
+
+    assert len(detector._last_fire) <= detector._LAST_FIRE_PRUNE_AT
+
+
+def test_threat_patterns_concurrent_add():
+    """Scans running while patterns are added never fail or lose patterns"""
+    from bosco_os.capabilities.security.threat_detector import ThreatDetector, ThreatPattern
+
+    detector = ThreatDetector({"debounce_seconds": 0})
+    path = _write_log([f"keyword_{i} seen" for i in range(40)])
+    errors = []
+    done = threading.Event()
+
+    def scan():
+        while not done.is_set():
+            try:
+                detector.detect_in_log(path, lines=40)
+                detector.detect_in_text("keyword_7 seen", source="concurrent")
+            except Exception as e:
+                errors.append(e)
+
+    scanners = [threading.Thread(target=scan) for _ in range(4)]
+    for thread in scanners:
+        thread.start()
+    try:
+        for i in range(40):
+            detector.add_pattern(ThreatPattern(
+                name=f"keyword_{i}",
+                pattern=f"keyword_{i}",
+                severity="low",
+                description="Concurrent test pattern"
+            ))
+    finally:
+        done.set()
+        for thread in scanners:
+            thread.join()
+
+    try:
+        events = detector.detect_in_log(path, lines=40)
+    finally:
+        os.unlink(path)
+
+    assert not errors, errors[0]
+    names = {e.pattern_name for e in events}
+    assert all(f"keyword_{i}" in names for i in range(40)), sorted(names)
+
+
+def test_shell_follows_cwd_and_env():
+    """Commands see os.chdir and os.environ changes, and run under /bin/sh"""
+    from bosco_os.capabilities.system.full_control import TerminalControl
+
+    terminal = TerminalControl()
+    original = os.getcwd()
+    scratch = tempfile.mkdtemp()
+    try:
+        first = terminal.execute('pwd')
+        assert first['stdout'].strip() == original, first
+
+        os.chdir(scratch)
+        moved = terminal.execute('pwd')
+        assert moved['stdout'].strip() == os.path.realpath(scratch), moved
+
+        os.environ['BOSCO_TEST_VAR'] = 'bar'
+        echoed = terminal.execute('echo "$BOSCO_TEST_VAR"')
+        assert echoed['stdout'].strip() == 'bar', echoed
+
+        del os.environ['BOSCO_TEST_VAR']
+        unset = terminal.execute('echo "${BOSCO_TEST_VAR-unset}"')
+        assert unset['stdout'].strip() == 'unset', unset
+
+        # cd inside a command doesn't leak into the next one
+        terminal.execute('cd /')
+        again = terminal.execute('pwd')
+        assert again['stdout'].strip() == os.path.realpath(scratch), again
+
+        shell = terminal.execute('echo $0')
+        assert shell['stdout'].strip() == '/bin/sh', shell
+    finally:
+        os.environ.pop('BOSCO_TEST_VAR', None)
+        os.chdir(original)
+        os.rmdir(scratch)
+
+
+def test_shell_output_not_shared():
+    """A backgrounded job's output never shows up in a later command's result"""
+    from bosco_os.capabilities.system.full_control import TerminalControl
+
+    terminal = TerminalControl()
+    terminal.execute('(sleep 0.3; echo LEAK) &')
+    following = terminal.execute('echo next')
+    assert following['stdout'] == 'next\n', following
+
+
+def test_spawn_detached_reaped():
+    """Detached launches get their own session, no stdin, and are reaped"""
+    import time
+    from bosco_os.capabilities.system import spawn
+
+    pid = spawn.spawn_detached(['sleep', '0.1'])
+    assert os.getsid(pid) == pid, "child should lead its own session"
+    assert os.readlink(f'/proc/{pid}/fd/0') == os.devnull
+
+    deadline = time.monotonic() + 5
+    while pid in spawn._SPAWNED and time.monotonic() < deadline:
+        time.sleep(0.05)
+        spawn.reap_spawned()
+    assert pid not in spawn._SPAWNED
+    assert not os.path.exists(f'/proc/{pid}'), "exited child left as a zombie"
+
+
+def test_revalidation_cache_bounded():
+    """Stored bodies for conditional fetches stay under the byte budget"""
+    from bosco_os.capabilities.system.full_control import WebBrowser
+
+    browser = WebBrowser()
+    browser.REVALIDATE_CACHE_BYTES = 10_000
+    headers = {'ETag': '"v1"'}
+    for i in range(50):
+        browser._remember(f"https://example.com/{i}", headers, b"x" * 1000, "text/html")
+
+    assert browser._validator_bytes <= 10_000, browser._validator_bytes
+    assert browser._remembered("https://example.com/0") is None
+    assert browser._remembered("https://example.com/49")[2] == b"x" * 1000
+
+    # Search/page entries are untouched by stored bodies
+    browser._cache_put(('search', 'q', 5), [], browser.SEARCH_TTL)
+    for i in range(50, 100):
+        browser._remember(f"https://example.com/{i}", headers, b"x" * 1000, "text/html")
+    assert browser._cache_get(('search', 'q', 5)) == []
+
+
+def test_search_and_read_inside_event_loop():
+    """search_and_read works from sync code and from inside a running loop"""
+    from bosco_os.capabilities.system.full_control import FullSystemControl
+
+    control = FullSystemControl()
+
+    async def fake_fetch(query, num_results):
+        await asyncio.sleep(0)
+        return [{'title': 'Result', 'url': 'https://example.com', 'content': f'about {query}'}]
+
+    control.browser.search_and_fetch = fake_fetch
+
+    plain = control.search_and_read('bosco')
+    assert 'about bosco' in plain, plain
+
+    async def from_loop():
+        nested = control.search_and_read('nested')
+        awaited = await control.search_and_read_async('awaited')
+        return nested, awaited
+
+    nested, awaited = asyncio.run(from_loop())
+    assert 'about nested' in nested, nested
+    assert 'about awaited' in awaited, awaited
+
+
+def test_find_file_multi_part_names():
+    """find_file matches leading directories at any depth, like rglob"""
+    from bosco_os.capabilities.system.pc_control import PCControl
+
+    root = tempfile.mkdtemp()
+    project = os.path.join(root, 'user', 'projects', 'bot')
+    os.makedirs(project)
+    target = os.path.join(project, 'main.py')
+    open(target, 'w').close()
+    os.makedirs(os.path.join(root, 'other', 'bot'))
+    open(os.path.join(root, 'other', 'main.py'), 'w').close()
+
+    control = PCControl()
+    try:
+        assert control.find_file('projects/bot/main', root) == [target]
+        assert control.find_file('bot/main', root) == [target]
+        assert sorted(control.find_file('main', root)) == sorted(
+            [target, os.path.join(root, 'other', 'main.py')])
+        assert control.find_file(f'{project}/main', root) == [target]
+        assert control.find_file('user/bot/main', root) == []
+    finally:
+        shutil.rmtree(root)
+
+
+def test_proc_net_addr():
+    """/proc/net hex addresses decode the way ss prints them"""
+    import socket
+    from bosco_os.capabilities.system.kali_control import _proc_net_addr
+
+    assert _proc_net_addr(socket.AF_INET, '0100007F:0035') == '127.0.0.1:53'
+    assert _proc_net_addr(socket.AF_INET, '00000000:0000') == '0.0.0.0:*'
+    assert _proc_net_addr(socket.AF_INET, '0101A8C0:01BB') == '192.168.1.1:443'
+    assert _proc_net_addr(socket.AF_INET6, '00000000000000000000000001000000:0016') == '[::1]:22'
+    assert _proc_net_addr(socket.AF_INET6, '0000000000000000FFFF00000100007F:1F90') == '[::ffff:127.0.0.1]:8080'
+
+
+def test_read_proc_stat():
+    """/proc/stat cpu lines become (idle + iowait, total) pairs, guest excluded"""
+    from bosco_os.capabilities.system.kali_control import KaliLinuxControl
+
+    sample = (
+        "cpu  100 5 50 800 20 3 2 0 40 0\n"
+        "cpu0 60 5 30 400 10 2 1 0 40 0\n"
+        "cpu1 40 0 20 400 10 1 1 0 0 0\n"
+        "intr 12345 0 0\n"
+        "cpu9 should not be read\n"
+    )
+    handle = tempfile.NamedTemporaryFile('w', delete=False)
+    with handle:
+        handle.write(sample)
+    try:
+        counters = KaliLinuxControl._read_proc_stat(handle.name)
+    finally:
+        os.unlink(handle.name)
+
+    assert counters == [(820, 980), (410, 508), (410, 472)], counters
+
+
+def test_fast_process_list():
+    """The /proc process table finds processes whose names hold ') '"""
+    import subprocess
+    from bosco_os.capabilities.system.kali_control import KaliLinuxControl
+
+    if not os.path.isdir('/proc') or not os.path.exists('/bin/sleep'):
+        return  # Linux only
+
+    scratch = tempfile.mkdtemp()
+    odd = os.path.join(scratch, 'a) (b c')
+    os.symlink('/bin/sleep', odd)
+    child = subprocess.Popen([odd, '5'])
+    try:
+        control = KaliLinuxControl()
+        rows = {row['pid']: row for row in control._fast_process_list()}
+        assert rows[os.getpid()]['cpu_percent'] == 0.0  # first call has no baseline
+        assert rows[child.pid]['name'] == 'a) (b c', rows[child.pid]
+        assert 0.0 <= rows[os.getpid()]['memory_percent'] <= 100.0
+
+        rows = {row['pid']: row for row in control._fast_process_list()}
+        assert rows[os.getpid()]['cpu_percent'] >= 0.0
+    finally:
+        child.kill()
+        child.wait()
+        shutil.rmtree(scratch)
+
+
+def _navigator_recording_runs():
+    """HumanNavigator whose xdotool runs are recorded instead of executed"""
+    from bosco_os.capabilities.system.human_navigator import HumanNavigator
+
+    nav = HumanNavigator()
+    runs = []
+    nav._xdotool_run = lambda commands: runs.append(list(commands)) or True
+    return nav, runs
+
+
+def test_navigator_batch():
+    """batch() sends buffered xdotool commands in one run, flushing at type"""
+    nav, runs = _navigator_recording_runs()
+
+    with nav.batch():
+        nav._xdotool(('mousemove', 10, 20))
+        with nav.batch():  # nested blocks are flushed by the outer one
+            nav._xdotool(('click', 1))
+        assert runs == []
+        nav._xdotool(('type', '--delay', 10, 'hi'))
+        assert runs == [[('mousemove', 10, 20), ('click', 1), ('type', '--delay', 10, 'hi')]]
+        nav._xdotool(('key', 'Return'))
+
+    assert runs[1:] == [[('key', 'Return')]], runs
+    assert not nav._batching()
+
+    # Outside a batch each call runs straight away
+    nav._xdotool(('key', 'Tab'))
+    assert runs[-1] == [('key', 'Tab')]
+
+
+def test_navigator_async_actions():
+    """async_=True actions run in call order on the worker and return Futures"""
+    from bosco_os.capabilities.system.human_navigator import HumanNavigator, _backgroundable
+
+    calls = []
+
+    class Probe(HumanNavigator):
+        @_backgroundable
+        def record(self, value):
+            calls.append((value, threading.current_thread().name))
+            if value == 'boom':
+                raise ValueError(value)
+            return value
+
+    nav = Probe()
+    assert nav.record('now') == 'now'
+    futures = [nav.record(i, async_=True) for i in range(20)]
+    failing = nav.record('boom', async_=True)
+    nav.wait_idle()
+
+    assert [f.result() for f in futures] == list(range(20))
+    assert isinstance(failing.exception(), ValueError)
+    assert [value for value, _ in calls[1:21]] == list(range(20))
+    assert all(name == 'HumanNavigator' for _, name in calls[1:])
+
+    # Convenience wrappers forward async_ to the action they wrap
+    scrolled = []
+    nav.scroll = lambda clicks, **kwargs: scrolled.append((clicks, kwargs))
+    nav.scroll_up(async_=True)
+    nav.scroll_down(5, async_=True)
+    assert scrolled == [(3, {'async_': True}), (-5, {'async_': True})], scrolled
+
+
+def main():
+    """Run all tests"""
+    print("\n" + "#"*50)
+    print("# BOSCO CORE - PERFORMANCE PATHS TEST SUITE")
+    print("#"*50)
+
+    tests = [
+        ("Threat block scan: anchored patterns", test_threat_block_scan_anchored),
+        ("Threat patterns: bounded regex cache", test_threat_regex_cache_bounded),
+        ("Threat debounce: repeat counts", test_threat_debounce_counts),
+        ("Threat debounce: concurrent scanners", test_threat_debounce_threads),
+        ("Threat debounce: expired entries pruned", test_threat_debounce_pruned),
+        ("Threat patterns: concurrent add_pattern", test_threat_patterns_concurrent_add),
+        ("Shell: cwd and environment", test_shell_follows_cwd_and_env),
+        ("Shell: output not shared between commands", test_shell_output_not_shared),
+        ("Detached launches: session, stdin, reaping", test_spawn_detached_reaped),
+        ("Web cache: revalidation bodies bounded", test_revalidation_cache_bounded),
+        ("search_and_read: inside an event loop", test_search_and_read_inside_event_loop),
+        ("find_file: multi-part names", test_find_file_multi_part_names),
+        ("/proc/net address decoding", test_proc_net_addr),
+        ("/proc/stat parsing", test_read_proc_stat),
+        ("/proc process table", test_fast_process_list),
+        ("Navigator: batch()", test_navigator_batch),
+        ("Navigator: async_ actions", test_navigator_async_actions),
+    ]
+
+    results = []
+
+    for name, test_func in tests:
+        try:
+            test_func()
+            results.append((name, True, None))
+        except Exception as e:
+            results.append((name, False, e))
+
+    # Summary
+    print("\n" + "="*50)
+    print("TEST SUMMARY")
+    print("="*50)
+
+    passed = sum(1 for _, ok, _ in results if ok)
+    total = len(results)
+
+    for name, ok, error in results:
+        status = "✓ PASS" if ok else "✗ FAIL"
+        print(f"  {status}: {name}")
+        if error:
+            print(f"      Error: {error!r}")
+
+    print(f"\nTotal: {passed}/{total} tests passed")
+    return 0 if passed == total else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())